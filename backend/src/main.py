@@ -107,6 +107,8 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     print("Shutting down Multi-Framework Cybersecurity Metrics API...")
+    from .services.search.search_service import close_http_client
+    await close_http_client()
 
 
 # Create FastAPI app
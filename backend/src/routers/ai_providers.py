@@ -2,6 +2,7 @@
 
 Endpoints for managing AI provider configurations, credentials, and status.
 """
+import functools
 import logging
 from datetime import datetime
 from typing import List, Optional
@@ -28,7 +29,6 @@ from ..schemas import (
 )
 from ..services.ai import (
     get_provider,
-    get_available_providers,
     ProviderType,
     ProviderCredentials,
     is_provider_available,
@@ -111,6 +111,34 @@ def _build_provider_response(provider_info: dict) -> AIProviderSchema:
     )
 
 
+# Provider metadata is static, so each provider's schema is built once per
+# process. Availability is not: implementations can be registered later, so
+# it is checked on every request and applied to a copy. Callers must treat
+# the cached schemas as read-only.
+
+@functools.lru_cache(maxsize=None)
+def _provider_schema(provider_type: ProviderType) -> AIProviderSchema:
+    """Build the static metadata schema for a single registry provider."""
+    return _build_provider_response({
+        **PROVIDER_REGISTRY[provider_type],
+        "code": provider_type.value,
+    })
+
+
+def _provider_schema_with_availability(
+    provider_type: ProviderType,
+    unavailable_reason: Optional[str] = None,
+) -> AIProviderSchema:
+    """Return the provider schema with its current availability."""
+    schema = _provider_schema(provider_type)
+    if is_provider_available(provider_type):
+        return schema
+    return schema.model_copy(update={
+        "available": False,
+        "unavailable_reason": unavailable_reason,
+    })
+
+
 # ==============================================================================
 # Provider Discovery Endpoints
 # ==============================================================================
@@ -126,9 +154,12 @@ async def list_providers(
     - Available models with capabilities
     - Whether the provider implementation is available
     """
-    providers = get_available_providers()
-    provider_schemas = [_build_provider_response(p) for p in providers]
-
+    provider_schemas = [
+        _provider_schema_with_availability(
+            provider_type, "Provider implementation not loaded"
+        )
+        for provider_type in PROVIDER_REGISTRY
+    ]
     return AIProviderListResponse(
         providers=provider_schemas,
         total=len(provider_schemas),
@@ -666,12 +697,7 @@ async def get_provider_info(
             detail=f"Provider '{provider_code}' not found",
         )
 
-    provider_info = PROVIDER_REGISTRY[provider_type]
-    provider_info["available"] = is_provider_available(provider_type)
-    return _build_provider_response({
-        **provider_info,
-        "code": provider_code,
-    })
+    return _provider_schema_with_availability(provider_type)
 
 
 @router.get("/{provider_code}/models", response_model=List[AIModelSchema])
@@ -687,17 +713,4 @@ async def list_provider_models(
             detail=f"Provider '{provider_code}' not found",
         )
 
-    provider_info = PROVIDER_REGISTRY[provider_type]
-    models = []
-    for model in provider_info.get("models", []):
-        models.append(AIModelSchema(
-            model_id=model.model_id,
-            display_name=model.display_name,
-            description=model.description,
-            context_window=model.context_window,
-            max_output_tokens=model.max_output_tokens,
-            supports_vision=model.supports_vision,
-            supports_function_calling=model.supports_function_calling,
-        ))
-
-    return models
+    return _provider_schema(provider_type).models
@@ -7,14 +7,20 @@ Provides integration with AWS Bedrock foundation models including:
 - Amazon Nova
 """
 import asyncio
+import importlib.util
 import json
 import logging
 import time
 from typing import Any, Dict, List, Optional
 
-import boto3
 from botocore.exceptions import ClientError, NoCredentialsError
 
+# boto3 is imported when a session is built; importing it costs several times
+# more than the botocore exceptions above. Checking for it here keeps the
+# provider factory's ImportError handling unchanged when it is missing.
+if importlib.util.find_spec("boto3") is None:
+    raise ImportError("No module named 'boto3'")
+
 from ..base_provider import (
     BaseAIProvider,
     ProviderType,
@@ -74,6 +80,8 @@ class BedrockProvider(BaseAIProvider):
 
         self._region = credentials.aws_region or "us-east-1"
 
+        import boto3
+
         try:
             session_kwargs = {
                 "aws_access_key_id": credentials.aws_access_key,
@@ -107,6 +115,8 @@ class BedrockProvider(BaseAIProvider):
 
         region = credentials.aws_region or "us-east-1"
 
+        import boto3
+
         try:
             session_kwargs = {
                 "aws_access_key_id": credentials.aws_access_key,
@@ -7,6 +7,7 @@ Provides integration with Google Cloud's Vertex AI including:
 - Claude (via Model Garden)
 """
 import asyncio
+import importlib.util
 import json
 import logging
 import time
@@ -29,13 +30,13 @@ from ..provider_registry import get_models_for_provider
 
 logger = logging.getLogger(__name__)
 
-# Try to import google-genai
+# Check for google-genai without importing it. The SDK takes far longer to
+# import than the rest of the provider stack, so it is loaded on first use.
 try:
-    from google import genai
-    from google.genai import types
-    GENAI_AVAILABLE = True
-except ImportError:
+    GENAI_AVAILABLE = importlib.util.find_spec("google.genai") is not None
+except ModuleNotFoundError:
     GENAI_AVAILABLE = False
+if not GENAI_AVAILABLE:
     logger.warning("google-genai package not installed. Vertex AI provider will not be available.")
 
 
@@ -85,6 +86,8 @@ class VertexAIProvider(BaseAIProvider):
         self._project = credentials.gcp_project
         self._location = credentials.gcp_location or "us-central1"
 
+        from google import genai
+
         try:
             # Initialize the client
             if credentials.gcp_credentials_json:
@@ -129,6 +132,9 @@ class VertexAIProvider(BaseAIProvider):
         if not credentials.gcp_project:
             return False
 
+        from google import genai
+        from google.genai import types
+
         try:
             # Temporarily initialize to validate
             if credentials.gcp_credentials_json:
@@ -228,6 +234,8 @@ class VertexAIProvider(BaseAIProvider):
         start_time: float,
     ) -> AIResponse:
         """Invoke Gemini model on Vertex AI."""
+        from google.genai import types
+
         # Build contents from messages
         contents = []
         for msg in messages:
@@ -6,6 +6,7 @@ and other sensitive credentials.
 import os
 import json
 import logging
+import threading
 from typing import Dict, Any, Optional
 
 from cryptography.fernet import Fernet, InvalidToken
@@ -28,11 +29,15 @@ class CredentialEncryption:
 
     _instance: Optional["CredentialEncryption"] = None
     _fernet: Optional[Fernet] = None
+    _lock = threading.Lock()
 
     def __new__(cls) -> "CredentialEncryption":
         """Singleton pattern - reuse the same Fernet instance."""
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            with cls._lock:
+                # Re-check: another thread may have created it while we waited
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
         return cls._instance
 
     def __init__(self) -> None:
@@ -9,13 +9,105 @@ into AI prompts to augment responses with real-time information.
 """
 import asyncio
 import logging
+import os
+import threading
+import time
+import weakref
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Optional
+from typing import Any, Hashable, List, Optional, Tuple
+
+import httpx
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of outbound searches allowed in flight at once
+SEARCH_MAX_CONCURRENCY = int(os.getenv("SEARCH_MAX_CONCURRENCY", "8"))
+
+# SearchService is created per request, so the cap has to live at module
+# level to bound concurrency across requests. asyncio primitives belong to a
+# single event loop, so there is one semaphore per running loop.
+_search_semaphores: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _get_search_semaphore() -> asyncio.Semaphore:
+    """Get the search semaphore for the running event loop."""
+    loop = asyncio.get_running_loop()
+    sem = _search_semaphores.get(loop)
+    if sem is None:
+        sem = _search_semaphores[loop] = asyncio.Semaphore(SEARCH_MAX_CONCURRENCY)
+    return sem
+
+
+# Longer queries are rejected rather than sent upstream
+SEARCH_MAX_QUERY_LENGTH = 512
+
+# How long successful search responses are reused for identical queries
+SEARCH_CACHE_TTL_SECONDS = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", "300"))
+SEARCH_CACHE_MAX_SIZE = 512
+
+
+class _TTLCache:
+    """Small thread-safe LRU cache whose entries expire after a fixed TTL."""
+
+    def __init__(self, ttl_seconds: float, maxsize: int):
+        self._ttl = ttl_seconds
+        self._maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (hit, value); expired entries count as misses."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self._ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_search_cache = _TTLCache(SEARCH_CACHE_TTL_SECONDS, SEARCH_CACHE_MAX_SIZE)
+
+# One pooled async HTTP client per event loop, shared by the HTTP-based
+# providers. The app lifespan closes it on shutdown.
+SEARCH_HTTP_TIMEOUT_SECONDS = 15.0
+_http_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Get the async HTTP client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _http_clients[loop] = httpx.AsyncClient(
+            timeout=SEARCH_HTTP_TIMEOUT_SECONDS
+        )
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the running event loop's HTTP client, if one was opened."""
+    client = _http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
 
 class SearchProvider(str, Enum):
     """Supported search providers."""
@@ -23,7 +115,7 @@ class SearchProvider(str, Enum):
     TAVILY = "tavily"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SearchResult:
     """A single search result."""
     title: str
@@ -32,7 +124,7 @@ class SearchResult:
     source: str = ""
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SearchResponse:
     """Response from a search operation."""
     query: str
@@ -61,6 +153,8 @@ class DuckDuckGoSearchProvider(BaseSearchProvider):
     """Free search via the duckduckgo-search library.
 
     No API key required. Rate limited but sufficient for typical usage.
+    The ddgs client is synchronous, so it still runs on a worker thread;
+    SEARCH_MAX_CONCURRENCY keeps it from exhausting the default executor.
     """
 
     async def search(self, query: str, max_results: int = 5) -> List[SearchResult]:
@@ -86,19 +180,23 @@ class TavilySearchProvider(BaseSearchProvider):
     """Premium search via Tavily API.
 
     Requires an API key. Returns AI-optimized, clean text results.
+    Calls the REST endpoint directly on the shared async HTTP client, so no
+    executor thread is held for the duration of the request.
     """
 
+    API_URL = "https://api.tavily.com/search"
+
     def __init__(self, api_key: str):
         self.api_key = api_key
 
     async def search(self, query: str, max_results: int = 5) -> List[SearchResult]:
-        from tavily import TavilyClient
-
-        def _search():
-            client = TavilyClient(api_key=self.api_key)
-            return client.search(query, max_results=max_results)
-
-        response = await asyncio.to_thread(_search)
+        client = _get_http_client()
+        resp = await client.post(
+            self.API_URL,
+            json={"query": query, "max_results": max_results},
+            headers={"Authorization": f"Bearer {self.api_key}"},
+        )
+        resp.raise_for_status()
         return [
             SearchResult(
                 title=r.get("title", ""),
@@ -106,13 +204,17 @@ class TavilySearchProvider(BaseSearchProvider):
                 snippet=r.get("content", ""),
                 source="Tavily",
             )
-            for r in response.get("results", [])
+            for r in resp.json().get("results", [])
         ]
 
 
 class SearchService:
     """Main search service with provider selection and result formatting.
 
+    Outbound searches are capped at SEARCH_MAX_CONCURRENCY across all
+    instances; extra callers queue rather than fail. Successful responses
+    are cached for SEARCH_CACHE_TTL_SECONDS per (provider, query, max_results).
+
     Usage:
         service = SearchService()  # Uses DuckDuckGo by default
         response = await service.search("cybersecurity MTTD benchmarks")
@@ -138,10 +240,29 @@ class SearchService:
             max_results: Maximum results to return
 
         Returns:
-            SearchResponse with results (empty list on failure)
+            SearchResponse with results (empty list on failure or for an
+            empty/oversized query)
         """
+        # Collapse whitespace so trivially different queries share a cache entry
+        query = " ".join(query.split())
+        if not query or len(query) > SEARCH_MAX_QUERY_LENGTH:
+            return SearchResponse(query=query, results=[], provider=self._provider_type)
+
+        cache_key = (self._provider_type.value, query.lower(), max_results)
+        hit, cached = _search_cache.get(cache_key)
+        if hit:
+            return SearchResponse(
+                query=query,
+                results=list(cached),
+                provider=self._provider_type,
+            )
+
         try:
-            results = await self._provider.search(query, max_results)
+            async with _get_search_semaphore():
+                results = await self._provider.search(query, max_results)
+            # Only cache non-empty results so transient failures aren't pinned
+            if results:
+                _search_cache.set(cache_key, tuple(results))
             return SearchResponse(
                 query=query,
                 results=results,
@@ -168,10 +289,11 @@ class SearchService:
         if not response.results:
             return ""
 
-        lines = [f'--- Web Search Results for: "{response.query}" ---\n']
-        for i, r in enumerate(response.results, 1):
-            lines.append(f"{i}. {r.title}")
-            lines.append(f"   URL: {r.url}")
-            lines.append(f"   {r.snippet}\n")
-        lines.append("--- End of Search Results ---")
-        return "\n".join(lines)
+        body = "\n".join(
+            f"{i}. {r.title}\n   URL: {r.url}\n   {r.snippet}\n"
+            for i, r in enumerate(response.results, 1)
+        )
+        return (
+            f'--- Web Search Results for: "{response.query}" ---\n\n'
+            f"{body}\n--- End of Search Results ---"
+        )
@@ -6,26 +6,64 @@ backward compatibility for single-worker development (in-memory).
 """
 
 import os
-import json
+import heapq
 import logging
 import secrets
 import threading
+import time
 from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
 from typing import Optional, NamedTuple
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
 # Configuration
 SESSION_TTL_HOURS = int(os.getenv("SESSION_TTL_HOURS", "24"))
 SESSION_TTL_SECONDS = SESSION_TTL_HOURS * 3600
+REDIS_POOL_SIZE = int(os.getenv("REDIS_POOL_SIZE", "50"))
+# Seconds a request waits for a free pooled connection before giving up
+REDIS_POOL_TIMEOUT = int(os.getenv("REDIS_POOL_TIMEOUT", "5"))
+
+# One connection pool per Redis URL, shared by every storage instance
+_redis_pools: dict = {}
+_redis_pools_lock = threading.Lock()
+
+
+def _get_redis_pool(redis_url: str):
+    """Get the process-wide connection pool for a Redis URL."""
+    pool = _redis_pools.get(redis_url)
+    if pool is None:
+        import redis
+        with _redis_pools_lock:
+            pool = _redis_pools.get(redis_url)
+            if pool is None:
+                # Blocking, so a burst of requests waits for a connection
+                # instead of failing with "Too many connections" (which
+                # get() would report as a missing session)
+                pool = redis.BlockingConnectionPool.from_url(
+                    redis_url,
+                    max_connections=REDIS_POOL_SIZE,
+                    timeout=REDIS_POOL_TIMEOUT,
+                    decode_responses=True,
+                    socket_connect_timeout=5,
+                    socket_timeout=5,
+                    retry_on_timeout=True,
+                )
+                _redis_pools[redis_url] = pool
+    return pool
 
 
 class SessionData(NamedTuple):
-    """Session data with expiration tracking."""
+    """Session data with expiration tracking.
+
+    Timestamps are Unix epoch seconds (time.time()) so expiry checks are a
+    single float subtraction on the request path.
+    """
     email: str
-    created_at: datetime
-    last_accessed: datetime
+    created_at: float
+    last_accessed: float
 
 
 class SessionStorageBackend(ABC):
@@ -46,6 +84,17 @@ class SessionStorageBackend(ABC):
         """Update last_accessed time and reset TTL. Returns True on success."""
         pass
 
+    def get_and_touch(self, token: str, ttl_seconds: int) -> Optional[SessionData]:
+        """Get a valid session and refresh its access time.
+
+        Backends override this to avoid separate lookups; the default simply
+        combines get() and update_access_time().
+        """
+        session = self.get(token)
+        if session:
+            self.update_access_time(token, ttl_seconds)
+        return session
+
     @abstractmethod
     def delete(self, token: str) -> Optional[str]:
         """Delete a session, returning the email if found."""
@@ -62,72 +111,148 @@ class SessionStorageBackend(ABC):
         pass
 
 
+class _SessionShard:
+    """One lock-guarded slice of the in-memory session map."""
+
+    __slots__ = ("lock", "sessions", "expiry_heap", "by_email")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sessions: dict[str, SessionData] = {}
+        # (expires_at, token) entries; may be stale after refresh or delete
+        self.expiry_heap: list[tuple[float, str]] = []
+        # email -> tokens in this shard, mirroring the Redis email index
+        self.by_email: dict[str, set[str]] = {}
+
+    def remove(self, token: str) -> Optional[SessionData]:
+        """Remove a session and its email index entry. Caller holds lock."""
+        session = self.sessions.pop(token, None)
+        if session is not None:
+            tokens = self.by_email.get(session.email)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self.by_email[session.email]
+        return session
+
+
 class InMemorySessionStorage(SessionStorageBackend):
     """Thread-safe in-memory session storage (single-worker fallback).
 
     Suitable for development and single-worker deployments.
     Sessions are lost on application restart.
+
+    Sessions are split across shards, each guarded by its own lock, so
+    concurrent requests for different tokens rarely contend. Each shard
+    keeps a min-heap of expiry times so cleanup only visits sessions that
+    are actually due.
     """
 
+    SHARD_COUNT = 16
+
     def __init__(self, ttl_hours: int = SESSION_TTL_HOURS):
-        self._sessions: dict[str, SessionData] = {}
-        self._lock = threading.Lock()
+        self._shards = [_SessionShard() for _ in range(self.SHARD_COUNT)]
         self._ttl_hours = ttl_hours
+        self._ttl_seconds = ttl_hours * 3600
+
+    def _shard(self, token: str) -> _SessionShard:
+        return self._shards[hash(token) % self.SHARD_COUNT]
 
     def create(self, token: str, session: SessionData, ttl_seconds: int) -> bool:
-        with self._lock:
-            self._sessions[token] = session
+        shard = self._shard(token)
+        with shard.lock:
+            shard.sessions[token] = session
+            shard.by_email.setdefault(session.email, set()).add(token)
+            heap = shard.expiry_heap
+            heapq.heappush(heap, (session.last_accessed + self._ttl_seconds, token))
+            # Drop stale entries left by deletes once they dominate the heap
+            if len(heap) > 2 * len(shard.sessions) + 64:
+                heap[:] = [
+                    (s.last_accessed + self._ttl_seconds, t)
+                    for t, s in shard.sessions.items()
+                ]
+                heapq.heapify(heap)
         return True
 
     def get(self, token: str) -> Optional[SessionData]:
-        with self._lock:
-            session = self._sessions.get(token)
+        shard = self._shard(token)
+        with shard.lock:
+            session = shard.sessions.get(token)
             if not session:
                 return None
 
             # Check expiration
-            now = datetime.utcnow()
-            if now - session.last_accessed > timedelta(hours=self._ttl_hours):
-                self._sessions.pop(token, None)
+            if time.time() - session.last_accessed > self._ttl_seconds:
+                shard.remove(token)
                 return None
 
             return session
 
     def update_access_time(self, token: str, ttl_seconds: int) -> bool:
-        with self._lock:
-            session = self._sessions.get(token)
+        shard = self._shard(token)
+        with shard.lock:
+            session = shard.sessions.get(token)
             if not session:
                 return False
 
-            self._sessions[token] = SessionData(
-                email=session.email,
-                created_at=session.created_at,
-                last_accessed=datetime.utcnow()
-            )
+            # The heap entry is left as-is; cleanup re-queues refreshed sessions
+            shard.sessions[token] = session._replace(last_accessed=time.time())
             return True
 
+    def get_and_touch(self, token: str, ttl_seconds: int) -> Optional[SessionData]:
+        shard = self._shard(token)
+        with shard.lock:
+            session = shard.sessions.get(token)
+            if not session:
+                return None
+
+            now = time.time()
+            if now - session.last_accessed > self._ttl_seconds:
+                shard.remove(token)
+                return None
+
+            shard.sessions[token] = session._replace(last_accessed=now)
+            return session
+
     def delete(self, token: str) -> Optional[str]:
-        with self._lock:
-            session = self._sessions.pop(token, None)
+        shard = self._shard(token)
+        with shard.lock:
+            session = shard.remove(token)
             return session.email if session else None
 
     def delete_by_email(self, email: str) -> int:
-        with self._lock:
-            tokens_to_remove = [t for t, s in self._sessions.items() if s.email == email]
-            for token in tokens_to_remove:
-                self._sessions.pop(token, None)
-            return len(tokens_to_remove)
+        removed = 0
+        for shard in self._shards:
+            with shard.lock:
+                tokens = shard.by_email.pop(email, None)
+                if not tokens:
+                    continue
+                for token in tokens:
+                    shard.sessions.pop(token, None)
+                removed += len(tokens)
+        return removed
 
     def cleanup_expired(self) -> int:
-        now = datetime.utcnow()
-        with self._lock:
-            expired = [
-                t for t, s in self._sessions.items()
-                if now - s.last_accessed > timedelta(hours=self._ttl_hours)
-            ]
-            for token in expired:
-                self._sessions.pop(token, None)
-            return len(expired)
+        now = time.time()
+        ttl = self._ttl_seconds
+        removed = 0
+        # Lock one shard at a time so cleanup never stalls every request
+        for shard in self._shards:
+            with shard.lock:
+                heap = shard.expiry_heap
+                while heap and heap[0][0] < now:
+                    _, token = heapq.heappop(heap)
+                    session = shard.sessions.get(token)
+                    if session is None:
+                        continue  # Already deleted
+                    expires_at = session.last_accessed + ttl
+                    if expires_at < now:
+                        shard.remove(token)
+                        removed += 1
+                    else:
+                        # Refreshed since queued; re-queue at its real expiry
+                        heapq.heappush(heap, (expires_at, token))
+        return removed
 
 
 class RedisSessionStorage(SessionStorageBackend):
@@ -141,31 +266,66 @@ class RedisSessionStorage(SessionStorageBackend):
     TOKEN_PREFIX = "session:token:"      # session:token:<token> -> JSON session data
     EMAIL_PREFIX = "session:email:"      # session:email:<email> -> SET of tokens
 
+    # Fetch a session, stamp last_accessed and reset its TTL in one round trip.
+    # KEYS[1] = token key, ARGV[1] = ttl seconds, ARGV[2] = now (epoch)
+    # Returns the payload as it was before the update.
+    GET_AND_TOUCH_SCRIPT = """
+local data = redis.call('GET', KEYS[1])
+if not data then
+    return nil
+end
+local session = cjson.decode(data)
+session['last_accessed'] = tonumber(ARGV[2])
+redis.call('SETEX', KEYS[1], ARGV[1], cjson.encode(session))
+return data
+"""
+
+    # Delete every session in a user's token set, then the set itself.
+    # KEYS[1] = email key, ARGV[1] = token key prefix. Returns tokens removed.
+    DELETE_BY_EMAIL_SCRIPT = """
+local tokens = redis.call('SMEMBERS', KEYS[1])
+for _, token in ipairs(tokens) do
+    redis.call('DEL', ARGV[1] .. token)
+end
+redis.call('DEL', KEYS[1])
+return #tokens
+"""
+
     def __init__(self, redis_url: str, ttl_hours: int = SESSION_TTL_HOURS):
         import redis
-        self._redis = redis.from_url(
-            redis_url,
-            decode_responses=True,
-            socket_connect_timeout=5,
-            socket_timeout=5,
-            retry_on_timeout=True,
-        )
+        self._redis = redis.Redis(connection_pool=_get_redis_pool(redis_url))
         self._ttl_hours = ttl_hours
         self._ttl_seconds = ttl_hours * 3600
+        self._get_and_touch_script = self._redis.register_script(
+            self.GET_AND_TOUCH_SCRIPT
+        )
+        self._delete_by_email_script = self._redis.register_script(
+            self.DELETE_BY_EMAIL_SCRIPT
+        )
 
-    def _session_to_json(self, session: SessionData) -> str:
-        return json.dumps({
+    @staticmethod
+    def _to_epoch(value) -> float:
+        if isinstance(value, str):
+            # Sessions written by older versions stored naive-UTC ISO strings
+            parsed = datetime.fromisoformat(value)
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            return parsed.timestamp()
+        return float(value)
+
+    def _session_to_json(self, session: SessionData) -> bytes:
+        return orjson.dumps({
             "email": session.email,
-            "created_at": session.created_at.isoformat(),
-            "last_accessed": session.last_accessed.isoformat(),
+            "created_at": session.created_at,
+            "last_accessed": session.last_accessed,
         })
 
-    def _json_to_session(self, data: str) -> SessionData:
-        parsed = json.loads(data)
+    def _json_to_session(self, data) -> SessionData:
+        parsed = orjson.loads(data)
         return SessionData(
             email=parsed["email"],
-            created_at=datetime.fromisoformat(parsed["created_at"]),
-            last_accessed=datetime.fromisoformat(parsed["last_accessed"]),
+            created_at=self._to_epoch(parsed["created_at"]),
+            last_accessed=self._to_epoch(parsed["last_accessed"]),
         )
 
     def create(self, token: str, session: SessionData, ttl_seconds: int) -> bool:
@@ -198,23 +358,26 @@ class RedisSessionStorage(SessionStorageBackend):
     def update_access_time(self, token: str, ttl_seconds: int) -> bool:
         try:
             token_key = f"{self.TOKEN_PREFIX}{token}"
-            data = self._redis.get(token_key)
-            if not data:
-                return False
-
-            session = self._json_to_session(data)
-            updated = SessionData(
-                email=session.email,
-                created_at=session.created_at,
-                last_accessed=datetime.utcnow(),
-            )
-            # Update and reset TTL
-            self._redis.setex(token_key, ttl_seconds, self._session_to_json(updated))
-            return True
+            # Expiry is enforced by the key TTL, so resetting it is enough;
+            # the stored last_accessed stamp is left for get_and_touch().
+            return bool(self._redis.expire(token_key, ttl_seconds))
         except Exception as e:
             logger.error(f"Redis update access time error: {e}")
             return False
 
+    def get_and_touch(self, token: str, ttl_seconds: int) -> Optional[SessionData]:
+        try:
+            token_key = f"{self.TOKEN_PREFIX}{token}"
+            data = self._get_and_touch_script(
+                keys=[token_key], args=[ttl_seconds, time.time()]
+            )
+            if not data:
+                return None
+            return self._json_to_session(data)
+        except Exception as e:
+            logger.error(f"Redis get and touch session error: {e}")
+            return None
+
     def delete(self, token: str) -> Optional[str]:
         try:
             token_key = f"{self.TOKEN_PREFIX}{token}"
@@ -235,16 +398,9 @@ class RedisSessionStorage(SessionStorageBackend):
     def delete_by_email(self, email: str) -> int:
         try:
             email_key = f"{self.EMAIL_PREFIX}{email}"
-            tokens = self._redis.smembers(email_key)
-            if not tokens:
-                return 0
-
-            pipe = self._redis.pipeline()
-            for token in tokens:
-                pipe.delete(f"{self.TOKEN_PREFIX}{token}")
-            pipe.delete(email_key)
-            pipe.execute()
-            return len(tokens)
+            return int(self._delete_by_email_script(
+                keys=[email_key], args=[self.TOKEN_PREFIX]
+            ))
         except Exception as e:
             logger.error(f"Redis delete by email error: {e}")
             return 0
@@ -312,7 +468,7 @@ def create_session(email: str) -> str:
     Returns the session token.
     """
     token = secrets.token_urlsafe(32)
-    now = datetime.utcnow()
+    now = time.time()
     session = SessionData(
         email=email,
         created_at=now,
@@ -330,12 +486,8 @@ def get_session(token: str) -> Optional[SessionData]:
     """
     if not token:
         return None
-    storage = get_storage()
-    session = storage.get(token)
-    if session:
-        # Update last accessed time (extends TTL in Redis)
-        storage.update_access_time(token, SESSION_TTL_SECONDS)
-    return session
+    # Fetch and refresh last accessed time together (extends TTL in Redis)
+    return get_storage().get_and_touch(token, SESSION_TTL_SECONDS)
 
 
 def invalidate_session(token: str) -> Optional[str]:
@@ -13,21 +13,44 @@ import os
 import sys
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, Tuple
 
 from cryptography import x509
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.x509.oid import NameOID
 
 logger = logging.getLogger(__name__)
 
+# Parsed validity window per (path, mtime_ns) so repeat checks skip PEM parsing
+_cert_cache: Dict[Tuple[str, int], Tuple[datetime, datetime]] = {}
+
 
 class TLSCertificateManager:
     """Manages self-signed TLS certificate generation and validation."""
 
     DEFAULT_VALIDITY_DAYS = 365
-    DEFAULT_KEY_SIZE = 2048
+    # P-256 keygen is near-instant (RSA-2048 takes ~100ms+) and, unlike
+    # Ed25519, is accepted for certificates by all major browsers.
+    DEFAULT_CURVE = ec.SECP256R1()
+
+    @staticmethod
+    def _write_file(path: Path, data: bytes, mode: int) -> None:
+        """Write data to a freshly created file with the given permissions.
+
+        Any existing file is removed first so the file is always created with
+        `mode` (O_EXCL); the key is never briefly readable by other users.
+        The mode is applied again with fchmod since os.open masks it by umask.
+        """
+        path.unlink(missing_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, mode)
+        try:
+            os.fchmod(fd, mode)
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
 
     @staticmethod
     def generate_certificate(
@@ -54,11 +77,8 @@ class TLSCertificateManager:
         cert_path.parent.mkdir(parents=True, exist_ok=True)
         key_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Generate RSA private key
-        private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=TLSCertificateManager.DEFAULT_KEY_SIZE,
-        )
+        # Generate ECDSA private key
+        private_key = ec.generate_private_key(TLSCertificateManager.DEFAULT_CURVE)
 
         # Build certificate
         subject = issuer = x509.Name([
@@ -86,23 +106,21 @@ class TLSCertificateManager:
             .sign(private_key, hashes.SHA256())
         )
 
-        # Write private key
-        with open(key_path, "wb") as f:
-            f.write(
-                private_key.private_bytes(
-                    encoding=serialization.Encoding.PEM,
-                    format=serialization.PrivateFormat.TraditionalOpenSSL,
-                    encryption_algorithm=serialization.NoEncryption(),
-                )
-            )
+        # Write private key (restrictive permissions from creation)
+        TLSCertificateManager._write_file(
+            key_path,
+            private_key.private_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PrivateFormat.PKCS8,
+                encryption_algorithm=serialization.NoEncryption(),
+            ),
+            0o600,
+        )
 
         # Write certificate
-        with open(cert_path, "wb") as f:
-            f.write(cert.public_bytes(serialization.Encoding.PEM))
-
-        # Restrictive permissions on private key
-        os.chmod(key_path, 0o600)
-        os.chmod(cert_path, 0o644)
+        TLSCertificateManager._write_file(
+            cert_path, cert.public_bytes(serialization.Encoding.PEM), 0o644
+        )
 
         logger.info(f"Certificate generated (valid {validity_days} days): {cert_path}")
         return (cert_path, key_path)
@@ -114,22 +132,30 @@ class TLSCertificateManager:
         Returns True if the certificate is present and still valid.
         """
         cert_path = Path(cert_path)
-        if not cert_path.exists():
+        try:
+            mtime_ns = cert_path.stat().st_mtime_ns
+        except OSError:
             return False
 
         try:
-            with open(cert_path, "rb") as f:
-                cert = x509.load_pem_x509_certificate(f.read())
+            cache_key = (str(cert_path), mtime_ns)
+            validity = _cert_cache.get(cache_key)
+            if validity is None:
+                with open(cert_path, "rb") as f:
+                    cert = x509.load_pem_x509_certificate(f.read())
+                validity = (cert.not_valid_before_utc, cert.not_valid_after_utc)
+                _cert_cache[cache_key] = validity
+            not_before, not_after = validity
 
             now = datetime.now(timezone.utc)
-            if now < cert.not_valid_before_utc:
+            if now < not_before:
                 logger.warning("Certificate not yet valid")
                 return False
-            if now > cert.not_valid_after_utc:
+            if now > not_after:
                 logger.warning("Certificate expired")
                 return False
 
-            days_left = (cert.not_valid_after_utc - now).days
+            days_left = (not_after - now).days
             if days_left < 30:
                 logger.warning(f"Certificate expires in {days_left} days")
 
@@ -2,16 +2,24 @@
 
 These responses simulate what different AI providers would return
 for various modes and actions in the AI chat system.
+
+JSON responses are built from a `*_DICT` payload, which tests can inspect
+directly instead of re-parsing the string; copy it before modifying it.
 """
 
-import json
+import orjson
+
+
+def _dumps(payload):
+    """Serialize a payload to a compact JSON string."""
+    return orjson.dumps(payload).decode("utf-8")
 
 
 # =============================================================================
 # METRICS MODE RESPONSES
 # =============================================================================
 
-METRICS_MODE_CREATE_RESPONSE = json.dumps({
+METRICS_MODE_CREATE_RESPONSE_DICT = {
     "assistant_message": "I've created a metric to track MFA adoption rate across your organization. This metric measures the percentage of users enrolled in multi-factor authentication, which is critical for access control under the PROTECT function.",
     "actions": [
         {
@@ -34,9 +42,10 @@ METRICS_MODE_CREATE_RESPONSE = json.dumps({
         }
     ],
     "needs_confirmation": True
-})
+}
+METRICS_MODE_CREATE_RESPONSE = _dumps(METRICS_MODE_CREATE_RESPONSE_DICT)
 
-METRICS_MODE_UPDATE_RESPONSE = json.dumps({
+METRICS_MODE_UPDATE_RESPONSE_DICT = {
     "assistant_message": "I've updated the target value for the MFA Adoption Rate metric to reflect the new enterprise standard of 99%.",
     "actions": [
         {
@@ -49,9 +58,10 @@ METRICS_MODE_UPDATE_RESPONSE = json.dumps({
         }
     ],
     "needs_confirmation": True
-})
+}
+METRICS_MODE_UPDATE_RESPONSE = _dumps(METRICS_MODE_UPDATE_RESPONSE_DICT)
 
-METRICS_MODE_DELETE_RESPONSE = json.dumps({
+METRICS_MODE_DELETE_RESPONSE_DICT = {
     "assistant_message": "I've marked the deprecated metric for removal. It will be deactivated rather than permanently deleted.",
     "actions": [
         {
@@ -60,7 +70,8 @@ METRICS_MODE_DELETE_RESPONSE = json.dumps({
         }
     ],
     "needs_confirmation": True
-})
+}
+METRICS_MODE_DELETE_RESPONSE = _dumps(METRICS_MODE_DELETE_RESPONSE_DICT)
 
 
 # =============================================================================
@@ -116,7 +127,7 @@ REPORT_MODE_RESPONSE = (
 # RECOMMENDATIONS MODE RESPONSES
 # =============================================================================
 
-RECOMMENDATIONS_RESPONSE = json.dumps({
+RECOMMENDATIONS_RESPONSE_DICT = {
     "recommendations": [
         {
             "metric_name": "Phishing Simulation Click Rate",
@@ -142,7 +153,8 @@ RECOMMENDATIONS_RESPONSE = json.dumps({
         "coverage_percentage": 75.0,
         "overall_assessment": "Current metric coverage addresses 75% of NIST CSF 2.0 categories. DETECT and RECOVER functions have the fewest metrics relative to their importance."
     }
-})
+}
+RECOMMENDATIONS_RESPONSE = _dumps(RECOMMENDATIONS_RESPONSE_DICT)
 
 
 # =============================================================================
@@ -162,7 +174,7 @@ EMPTY_RESPONSE = ""
 # GENERATE METRIC ENDPOINT RESPONSES
 # =============================================================================
 
-GENERATE_METRIC_RESPONSE = json.dumps({
+GENERATE_METRIC_RESPONSE_DICT = {
     "name": "Vulnerability Remediation SLA Compliance",
     "description": "Percentage of identified vulnerabilities remediated within the defined SLA timeframe based on severity (critical: 72h, high: 7d, medium: 30d, low: 90d)",
     "csf_function": "pr",
@@ -178,4 +190,5 @@ GENERATE_METRIC_RESPONSE = json.dumps({
     "formula": "Vulnerabilities Remediated Within SLA / Total Vulnerabilities Identified",
     "risk_definition": "Tracks the organization's ability to address known security weaknesses promptly. Poor remediation rates leave exploitable gaps that adversaries can leverage for unauthorized access or data breaches.",
     "notes": None
-})
+}
+GENERATE_METRIC_RESPONSE = _dumps(GENERATE_METRIC_RESPONSE_DICT)
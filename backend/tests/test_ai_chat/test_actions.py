@@ -6,85 +6,179 @@ Validates the full lifecycle of AI-generated actions:
 - Soft-deleting metrics via delete_metric
 - Audit log (AIChangeLog) creation
 - Error handling for confirmations, duplicates, missing metrics
+
+Runs against an in-memory SQLite database; each test's writes are rolled
+back when it finishes.
 """
 
 import uuid
-from datetime import datetime
-from unittest.mock import MagicMock, call, patch
 
+import orjson
 import pytest
-
-from src.models import AIChangeLog, Metric, MetricDirection
-
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from src.db import Base, get_db
+from src.main import app
+from src.models import (
+    AIChangeLog,
+    Framework,
+    FrameworkFunction,
+    Metric,
+    MetricDirection,
+)
+
+from .conftest import post_json
+
+
+# Fixed IDs for metrics that must not exist
+MISSING_UPDATE_METRIC_ID = uuid.UUID(int=1)
+MISSING_DELETE_METRIC_ID = uuid.UUID(int=2)
+
+
+# =============================================================================
+# DATABASE FIXTURES
+# =============================================================================
+
+@pytest.fixture(scope="class")
+def engine():
+    """In-memory SQLite engine with the full schema, shared by a test class."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    # pysqlite manages transactions itself and breaks SAVEPOINT handling;
+    # hand BEGIN over to SQLAlchemy so per-test rollback works
+    @event.listens_for(engine, "connect")
+    def disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def emit_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine, client):
+    """SQLite session served by get_db, rolled back after each test.
+
+    The session joins an outer transaction in savepoint mode, so the
+    router's commits only release savepoints and nothing outlives the test.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+
+    previous_override = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = lambda: session
+    yield session
+
+    if previous_override is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous_override
+    session.close()
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture
+def csf_function(db):
+    """CSF 2.0 framework with a single PROTECT function to attach metrics to."""
+    framework = Framework(code="csf_2_0", name="NIST Cybersecurity Framework 2.0")
+    db.add(framework)
+    db.flush()
+
+    function = FrameworkFunction(framework_id=framework.id, code="pr", name="Protect")
+    db.add(function)
+    db.flush()
+    return function
+
+
+def add_metric(db, function, name, **fields):
+    """Insert a metric under `function` and return it."""
+    metric = Metric(
+        name=name,
+        framework_id=function.framework_id,
+        function_id=function.id,
+        direction=MetricDirection.HIGHER_IS_BETTER,
+        **fields,
+    )
+    db.add(metric)
+    db.flush()
+    return metric
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
 
 class TestActionApply:
     """Tests for the POST /ai/actions/apply endpoint."""
 
-    def test_apply_add_metric_action(self, client, mock_db):
+    @pytest.mark.asyncio
+    async def test_apply_add_metric_action(self, async_client, db, csf_function):
         """Applying an add_metric action should create a new metric in the database."""
-        # Mock: no existing metric with that name
-        mock_db.query.return_value.filter.return_value.first.return_value = None
-
-        # Mock the Metric constructor in the router module so it returns
-        # a controlled mock object (the real Metric SQLAlchemy model cannot
-        # accept schema property fields like csf_function without a real DB).
-        new_metric_id = uuid.uuid4()
-        mock_metric_instance = MagicMock(spec=Metric)
-        mock_metric_instance.id = new_metric_id
-        mock_metric_instance.name = "Test MFA Metric"
-
-        with patch("src.routers.ai.Metric", return_value=mock_metric_instance):
-            response = client.post(
-                "/api/v1/ai/actions/apply",
-                json={
-                    "actions": [
-                        {
-                            "action": "add_metric",
-                            "metric": {
-                                "name": "Test MFA Metric",
-                                "description": "Percentage of users with MFA enabled",
-                                "direction": "higher_is_better",
-                                "priority_rank": 1,
-                                "target_value": 95.0,
-                                "target_units": "%",
-                            },
-                        }
-                    ],
-                    "user_confirmation": True,
-                },
-            )
+        response = await post_json(
+            async_client,
+            "/api/v1/ai/actions/apply",
+            {
+                "actions": [
+                    {
+                        "action": "add_metric",
+                        "metric": {
+                            "name": "Test MFA Metric",
+                            "description": "Percentage of users with MFA enabled",
+                            "direction": "higher_is_better",
+                            "priority_rank": 1,
+                            "target_value": 95.0,
+                            "target_units": "%",
+                        },
+                    }
+                ],
+                "user_confirmation": True,
+            },
+        )
 
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
 
         assert len(data["applied_results"]) == 1
         assert data["applied_results"][0]["action"] == "add_metric"
         assert data["applied_results"][0]["status"] == "created"
         assert data["applied_results"][0]["metric_name"] == "Test MFA Metric"
 
-        # Verify db.add was called (once for metric, once for change log)
-        assert mock_db.add.call_count >= 2
+        # The metric was stored against the resolved framework function
+        metric = db.query(Metric).filter(Metric.name == "Test MFA Metric").one()
+        assert metric.function_id == csf_function.id
+        assert metric.metric_number == "CSF-PR-001"
 
-    def test_apply_update_metric_action(self, client, mock_db):
+    @pytest.mark.asyncio
+    async def test_apply_update_metric_action(self, async_client, db, csf_function):
         """Applying an update_metric action should modify the existing metric."""
-        metric_id = uuid.uuid4()
-
-        # Create a mock existing metric
-        existing_metric = MagicMock(spec=Metric)
-        existing_metric.id = metric_id
-        existing_metric.name = "MFA Adoption Rate"
-        existing_metric.target_value = 95.0
-        existing_metric.description = "Original description"
-
-        mock_db.query.return_value.filter.return_value.first.return_value = existing_metric
+        existing_metric = add_metric(
+            db,
+            csf_function,
+            "MFA Adoption Rate",
+            target_value=95.0,
+            description="Original description",
+        )
 
-        response = client.post(
+        response = await post_json(
+            async_client,
             "/api/v1/ai/actions/apply",
-            json={
+            {
                 "actions": [
                     {
                         "action": "update_metric",
-                        "metric_id": str(metric_id),
+                        "metric_id": str(existing_metric.id),
                         "changes": {
                             "target_value": 99.0,
                             "description": "Updated to reflect zero-trust requirements",
@@ -96,31 +190,29 @@ class TestActionApply:
         )
 
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
 
         assert len(data["applied_results"]) == 1
         assert data["applied_results"][0]["action"] == "update_metric"
         assert data["applied_results"][0]["status"] == "updated"
         assert data["applied_results"][0]["changes_applied"]["target_value"] == 99.0
 
-    def test_apply_delete_metric_action(self, client, mock_db):
-        """Applying a delete_metric action should soft-delete (deactivate) the metric."""
-        metric_id = uuid.uuid4()
-
-        existing_metric = MagicMock(spec=Metric)
-        existing_metric.id = metric_id
-        existing_metric.name = "Deprecated Metric"
-        existing_metric.active = True
+        db.refresh(existing_metric)
+        assert existing_metric.target_value == 99.0
 
-        mock_db.query.return_value.filter.return_value.first.return_value = existing_metric
+    @pytest.mark.asyncio
+    async def test_apply_delete_metric_action(self, async_client, db, csf_function):
+        """Applying a delete_metric action should soft-delete (deactivate) the metric."""
+        existing_metric = add_metric(db, csf_function, "Deprecated Metric", active=True)
 
-        response = client.post(
+        response = await post_json(
+            async_client,
             "/api/v1/ai/actions/apply",
-            json={
+            {
                 "actions": [
                     {
                         "action": "delete_metric",
-                        "metric_id": str(metric_id),
+                        "metric_id": str(existing_metric.id),
                     }
                 ],
                 "user_confirmation": True,
@@ -128,33 +220,29 @@ class TestActionApply:
         )
 
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
 
         assert len(data["applied_results"]) == 1
         assert data["applied_results"][0]["action"] == "delete_metric"
         assert data["applied_results"][0]["status"] == "deactivated"
 
         # Verify the metric was soft-deleted (active = False)
+        db.refresh(existing_metric)
         assert existing_metric.active is False
 
-    def test_apply_creates_audit_log(self, client, mock_db):
+    @pytest.mark.asyncio
+    async def test_apply_creates_audit_log(self, async_client, db, csf_function):
         """Applying any action should create an AIChangeLog entry."""
-        metric_id = uuid.uuid4()
+        existing_metric = add_metric(db, csf_function, "Test Metric", active=True)
 
-        existing_metric = MagicMock(spec=Metric)
-        existing_metric.id = metric_id
-        existing_metric.name = "Test Metric"
-        existing_metric.active = True
-
-        mock_db.query.return_value.filter.return_value.first.return_value = existing_metric
-
-        response = client.post(
+        response = await post_json(
+            async_client,
             "/api/v1/ai/actions/apply",
-            json={
+            {
                 "actions": [
                     {
                         "action": "delete_metric",
-                        "metric_id": str(metric_id),
+                        "metric_id": str(existing_metric.id),
                     }
                 ],
                 "user_confirmation": True,
@@ -164,210 +252,120 @@ class TestActionApply:
         assert response.status_code == 200
 
         # Check that an AIChangeLog was added
-        add_calls = mock_db.add.call_args_list
-        changelog_added = any(
-            isinstance(call_args[0][0], AIChangeLog)
-            for call_args in add_calls
-            if call_args[0]
+        change_log = (
+            db.query(AIChangeLog)
+            .filter(AIChangeLog.metric_id == existing_metric.id)
+            .first()
         )
-        assert changelog_added, "Expected an AIChangeLog entry to be added to the session"
+        assert change_log is not None, "Expected an AIChangeLog entry to be added to the session"
+        assert change_log.applied is True
 
-    def test_apply_rejects_unconfirmed(self, client, mock_db):
-        """Actions without user_confirmation should be rejected with 400."""
-        response = client.post(
-            "/api/v1/ai/actions/apply",
-            json={
-                "actions": [
-                    {
-                        "action": "add_metric",
-                        "metric": {
-                            "name": "Unconfirmed Metric",
-                            "direction": "higher_is_better",
-                        },
-                    }
-                ],
-                "user_confirmation": False,
-            },
-        )
-
-        assert response.status_code == 400
-        data = response.json()
-        assert "confirmation" in data["detail"].lower()
-
-    def test_apply_duplicate_name_error(self, client, mock_db):
-        """Creating a metric with a name that already exists should produce an error."""
-        # Mock: existing metric with the same name found
-        existing_metric = MagicMock(spec=Metric)
-        existing_metric.id = uuid.uuid4()
-        existing_metric.name = "Duplicate Metric Name"
-
-        mock_db.query.return_value.filter.return_value.first.return_value = existing_metric
+    @pytest.mark.asyncio
+    async def test_apply_multiple_actions(self, async_client, db, csf_function):
+        """Multiple actions in a single request should each be processed."""
+        existing_metric = add_metric(db, csf_function, "Existing Metric", active=True)
 
-        response = client.post(
+        response = await post_json(
+            async_client,
             "/api/v1/ai/actions/apply",
-            json={
+            {
                 "actions": [
                     {
                         "action": "add_metric",
                         "metric": {
-                            "name": "Duplicate Metric Name",
+                            "name": "New Metric",
                             "direction": "higher_is_better",
                         },
-                    }
-                ],
-                "user_confirmation": True,
-            },
-        )
-
-        assert response.status_code == 200
-        data = response.json()
-
-        # The endpoint returns 200 with errors in the response body
-        assert len(data["errors"]) > 0
-        assert "already exists" in data["errors"][0].lower()
-        assert len(data["applied_results"]) == 0
-
-    def test_apply_nonexistent_metric_update(self, client, mock_db):
-        """Updating a metric that does not exist should produce an error."""
-        fake_id = uuid.uuid4()
-
-        # Mock: no metric found
-        mock_db.query.return_value.filter.return_value.first.return_value = None
-
-        response = client.post(
-            "/api/v1/ai/actions/apply",
-            json={
-                "actions": [
-                    {
-                        "action": "update_metric",
-                        "metric_id": str(fake_id),
-                        "changes": {"target_value": 99.0},
-                    }
-                ],
-                "user_confirmation": True,
-            },
-        )
-
-        assert response.status_code == 200
-        data = response.json()
-
-        assert len(data["errors"]) > 0
-        assert "not found" in data["errors"][0].lower()
-
-    def test_apply_nonexistent_metric_delete(self, client, mock_db):
-        """Deleting a metric that does not exist should produce an error."""
-        fake_id = uuid.uuid4()
-
-        mock_db.query.return_value.filter.return_value.first.return_value = None
-
-        response = client.post(
-            "/api/v1/ai/actions/apply",
-            json={
-                "actions": [
+                    },
                     {
                         "action": "delete_metric",
-                        "metric_id": str(fake_id),
-                    }
+                        "metric_id": str(existing_metric.id),
+                    },
                 ],
                 "user_confirmation": True,
             },
         )
 
         assert response.status_code == 200
-        data = response.json()
-
-        assert len(data["errors"]) > 0
-        assert "not found" in data["errors"][0].lower()
-
-    def test_apply_multiple_actions(self, client, mock_db):
-        """Multiple actions in a single request should each be processed."""
-        metric_id = uuid.uuid4()
-
-        existing_metric = MagicMock(spec=Metric)
-        existing_metric.id = metric_id
-        existing_metric.name = "Existing Metric"
-        existing_metric.active = True
-
-        # First call returns None (for add_metric duplicate check),
-        # second call returns existing_metric (for delete_metric lookup)
-        mock_db.query.return_value.filter.return_value.first.side_effect = [
-            None,  # No duplicate for add_metric
-            existing_metric,  # Found for delete_metric
-        ]
-
-        new_metric_id = uuid.uuid4()
-        mock_new_metric = MagicMock(spec=Metric)
-        mock_new_metric.id = new_metric_id
-        mock_new_metric.name = "New Metric"
-
-        with patch("src.routers.ai.Metric", return_value=mock_new_metric):
-            response = client.post(
-                "/api/v1/ai/actions/apply",
-                json={
-                    "actions": [
-                        {
-                            "action": "add_metric",
-                            "metric": {
-                                "name": "New Metric",
-                                "direction": "higher_is_better",
-                            },
-                        },
-                        {
-                            "action": "delete_metric",
-                            "metric_id": str(metric_id),
-                        },
-                    ],
-                    "user_confirmation": True,
-                },
-            )
-
-        assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
 
         assert len(data["applied_results"]) == 2
         assert data["applied_results"][0]["action"] == "add_metric"
         assert data["applied_results"][1]["action"] == "delete_metric"
 
-    def test_apply_unknown_action_type(self, client, mock_db):
-        """An unknown action type should be reported as an error.
-
-        Note: The schema validates action type with regex, so this
-        test verifies schema-level validation returns 422.
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "action,confirmed,existing_name,status,err_substr",
+        [
+            pytest.param(
+                {
+                    "action": "add_metric",
+                    "metric": {"name": "Unconfirmed Metric", "direction": "higher_is_better"},
+                },
+                False, None, 400, "confirmation",
+                id="rejects_unconfirmed",
+            ),
+            pytest.param(
+                {
+                    "action": "add_metric",
+                    "metric": {"name": "Duplicate Metric Name", "direction": "higher_is_better"},
+                },
+                True, "Duplicate Metric Name", 200, "already exists",
+                id="duplicate_name",
+            ),
+            pytest.param(
+                {
+                    "action": "update_metric",
+                    "metric_id": str(MISSING_UPDATE_METRIC_ID),
+                    "changes": {"target_value": 99.0},
+                },
+                True, None, 200, "not found",
+                id="nonexistent_metric_update",
+            ),
+            pytest.param(
+                {"action": "delete_metric", "metric_id": str(MISSING_DELETE_METRIC_ID)},
+                True, None, 200, "not found",
+                id="nonexistent_metric_delete",
+            ),
+            pytest.param(
+                {"action": "add_metric"},  # No 'metric' field
+                True, None, 200, "no metric data",
+                id="add_metric_missing_data",
+            ),
+            # The schema validates the action type with a regex, so this
+            # one is rejected before reaching the endpoint
+            pytest.param(
+                {"action": "unknown_action"},
+                True, None, 422, "unknown_action",
+                id="unknown_action_type",
+            ),
+        ],
+    )
+    async def test_apply_validation_errors(
+        self, async_client, db, csf_function,
+        action, confirmed, existing_name, status, err_substr,
+    ):
+        """Rejected or failed actions should report why without applying anything.
+
+        Errors found while applying come back as 200 with an `errors` list;
+        request-level problems are returned as an HTTP error with `detail`.
         """
-        response = client.post(
-            "/api/v1/ai/actions/apply",
-            json={
-                "actions": [
-                    {
-                        "action": "unknown_action",
-                    }
-                ],
-                "user_confirmation": True,
-            },
-        )
-
-        # The schema validation should reject this
-        assert response.status_code == 422
+        if existing_name:
+            add_metric(db, csf_function, existing_name)
 
-    def test_apply_add_metric_missing_data(self, client, mock_db):
-        """add_metric without metric data should produce an error."""
-        mock_db.query.return_value.filter.return_value.first.return_value = None
-
-        response = client.post(
+        response = await post_json(
+            async_client,
             "/api/v1/ai/actions/apply",
-            json={
-                "actions": [
-                    {
-                        "action": "add_metric",
-                        # No 'metric' field
-                    }
-                ],
-                "user_confirmation": True,
-            },
+            {"actions": [action], "user_confirmation": confirmed},
         )
 
-        assert response.status_code == 200
-        data = response.json()
+        assert response.status_code == status
+        data = orjson.loads(response.content)
 
-        assert len(data["errors"]) > 0
-        assert "no metric data" in data["errors"][0].lower()
+        if status == 200:
+            assert len(data["applied_results"]) == 0
+            assert len(data["errors"]) > 0
+            message = data["errors"][0]
+        else:
+            message = str(data["detail"])
+        assert err_substr in message.lower()
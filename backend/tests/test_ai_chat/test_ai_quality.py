@@ -7,25 +7,71 @@ These tests call the REAL AI endpoints (not mocked) and verify:
 4. Explanations are coherent and accurate
 5. Reports contain appropriate risk context
 
-These tests require a configured AI provider and will be skipped if unavailable.
-Run with: pytest tests/test_ai_chat/test_ai_quality.py -v --tb=short
-
-Note: These tests make actual AI API calls and may incur costs.
+RUN_LLM_TESTS is the only switch for live provider calls; it requires a
+configured AI provider.
+Run with: RUN_LLM_TESTS=1 pytest tests/test_ai_chat/test_ai_quality.py -v --tb=short
+
+Note: Live runs make actual AI API calls and may incur costs. With
+pytest-recording installed, they record provider HTTP traffic to cassettes
+under `cassettes/`. Without RUN_LLM_TESTS the tests only replay those
+cassettes (record_mode "none"), so a test without one fails instead of
+calling the provider; with no cassettes at all they are skipped. Replay is
+keyed on the full request, so a changed prompt fails with
+CannotOverwriteExistingCassetteException; delete the cassette and re-run
+with RUN_LLM_TESTS=1 to re-record it.
 """
 
+import asyncio
 import json
 import os
 import re
-from typing import Any, Dict, List, Optional, Set
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional
 
+import orjson
 import pytest
 from fastapi.testclient import TestClient
-
-# Skip all tests if no AI provider is configured
-pytestmark = pytest.mark.skipif(
-    not os.getenv("ANTHROPIC_API_KEY") and not os.getenv("OPENAI_API_KEY"),
-    reason="No AI provider API key configured"
-)
+from httpx import ASGITransport, AsyncClient
+
+from src.main import app
+
+from .conftest import JSON_HEADERS, post_json
+
+# vcrpy ships with pytest-recording; without it, calls go straight to the provider
+try:
+    import vcr
+    VCR_AVAILABLE = True
+except ImportError:
+    VCR_AVAILABLE = False
+
+LIVE_LLM = bool(os.getenv("RUN_LLM_TESTS"))
+HAS_PROVIDER_KEY = bool(os.getenv("ANTHROPIC_API_KEY") or os.getenv("OPENAI_API_KEY"))
+
+# Live runs need a configured provider; replay does not
+pytestmark = [
+    pytest.mark.skipif(
+        LIVE_LLM and not HAS_PROVIDER_KEY,
+        reason="No AI provider API key configured"
+    ),
+    pytest.mark.llm,
+    pytest.mark.vcr(),
+    # Keep real AI calls on one xdist worker: respects provider rate limits
+    # and lets the session fixtures run once under --dist=loadgroup
+    pytest.mark.xdist_group(name="ai_network"),
+]
+
+CASSETTE_DIR = Path(__file__).parent / "cassettes" / "test_ai_quality"
+
+# Keep provider credentials out of recorded cassettes, and replay a response
+# only for the exact request (prompt included) that produced it. Concurrent
+# batches hit the same provider URL, so matching on the URL alone could hand
+# one metric's response to another.
+VCR_CONFIG = {
+    "filter_headers": ["authorization", "x-api-key", "api-key"],
+    "record_mode": "once" if LIVE_LLM else "none",
+    "match_on": ("method", "scheme", "host", "port", "path", "query", "body"),
+}
 
 
 # =============================================================================
@@ -33,83 +79,249 @@ pytestmark = pytest.mark.skipif(
 # =============================================================================
 
 @pytest.fixture(scope="module")
+def vcr_config():
+    """pytest-recording settings for this module's cassettes."""
+    return VCR_CONFIG
+
+
+def fixture_cassette(name: str):
+    """Cassette for a fixture that outlives a single test.
+
+    Class- and session-scoped fixtures are set up outside pytest-recording's
+    per-test cassettes, so they record to their own file instead.
+    """
+    if not VCR_AVAILABLE:
+        return nullcontext()
+    return vcr.use_cassette(str(CASSETTE_DIR / f"{name}.yaml"), **VCR_CONFIG)
+
+
+@pytest.fixture(scope="session")
 def real_client():
-    """Create a test client connected to the real database and AI provider."""
-    from src.main import app
-    with TestClient(app) as client:
-        yield client
+    """Create a test client connected to the real database and AI provider.
+
+    Recorded cassettes carry no credentials and requests are not matched on
+    headers, so keyless replay resolves the legacy ANTHROPIC_API_KEY
+    provider with a placeholder key.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        if not LIVE_LLM and not HAS_PROVIDER_KEY:
+            mp.setenv("ANTHROPIC_API_KEY", "replay-placeholder")
+        with TestClient(app) as client:
+            yield client
+
+
+def _fetch_hierarchy(client, framework: str) -> Optional[Dict]:
+    """Fetch a framework hierarchy, or None if the API call fails.
+
+    Callers are session-scoped fixtures, so each hierarchy is fetched once
+    per test session from the database under test.
+    """
+    response = client.get(f"/api/v1/frameworks/{framework}/hierarchy")
+    if response.status_code != 200:
+        return None
+    return orjson.loads(response.content)
 
 
-@pytest.fixture(scope="module")
-def csf_valid_codes(real_client) -> Dict[str, Set[str]]:
+@pytest.fixture(scope="session")
+def csf_valid_codes(real_client) -> Dict[str, FrozenSet[str]]:
     """Fetch valid CSF 2.0 function and category codes from the API."""
-    response = real_client.get("/api/v1/frameworks/csf_2_0/hierarchy")
-    if response.status_code != 200:
+    data = _fetch_hierarchy(real_client, "csf_2_0")
+    if data is None:
         pytest.skip("Could not fetch CSF hierarchy")
 
-    data = response.json()
-    codes = {
-        "functions": set(),
-        "categories": set(),
-        "subcategories": set(),
+    functions = data.get("functions", [])
+    categories = [cat for func in functions for cat in func.get("categories", [])]
+    return {
+        "functions": frozenset(func["code"].lower() for func in functions),
+        "categories": frozenset(cat["code"].upper() for cat in categories),
+        "subcategories": frozenset(
+            subcat["code"].upper()
+            for cat in categories
+            for subcat in cat.get("subcategories", [])
+        ),
     }
 
-    for func in data.get("functions", []):
-        codes["functions"].add(func["code"].lower())
-        for cat in func.get("categories", []):
-            codes["categories"].add(cat["code"].upper())
-            for subcat in cat.get("subcategories", []):
-                codes["subcategories"].add(subcat["code"].upper())
 
-    return codes
-
-
-@pytest.fixture(scope="module")
-def ai_rmf_valid_codes(real_client) -> Dict[str, Set[str]]:
+@pytest.fixture(scope="session")
+def ai_rmf_valid_codes(real_client) -> Dict[str, FrozenSet[str]]:
     """Fetch valid AI RMF function and category codes from the API."""
-    response = real_client.get("/api/v1/frameworks/ai_rmf/hierarchy")
-    if response.status_code != 200:
+    data = _fetch_hierarchy(real_client, "ai_rmf")
+    if data is None:
         pytest.skip("Could not fetch AI RMF hierarchy")
 
-    data = response.json()
-    codes = {
-        "functions": set(),
-        "categories": set(),
+    functions = data.get("functions", [])
+    return {
+        "functions": frozenset(func["code"].lower() for func in functions),
+        "categories": frozenset(
+            cat["code"].upper()
+            for func in functions
+            for cat in func.get("categories", [])
+        ),
     }
 
-    for func in data.get("functions", []):
-        codes["functions"].add(func["code"].lower())
-        for cat in func.get("categories", []):
-            codes["categories"].add(cat["code"].upper())
 
-    return codes
+# Metrics generated once per session for TestCSFMetricGenerationQuality,
+# with the direction each one should obviously have
+CSF_GENERATION_EXPECTED_DIRECTIONS = {
+    "Security Awareness Training Completion Rate": "higher_is_better",
+    "Mean Time to Detect Security Incidents": "lower_is_better",
+    "Vulnerability Remediation SLA Compliance": "higher_is_better",
+    "Patch Management Compliance Rate": "higher_is_better",
+    "Mean Time to Respond (MTTR)": "lower_is_better",
+    "Privileged Access Management Compliance": "higher_is_better",
+}
+CSF_GENERATION_METRIC_NAMES = tuple(CSF_GENERATION_EXPECTED_DIRECTIONS)
+
+
+@pytest.fixture(scope="session")
+def generated_csf_metrics(real_client) -> Dict[str, Any]:
+    """Generate every CSF quality-test metric concurrently, keyed by name.
+
+    Each call is a real AI round trip, so issuing them together costs the
+    slowest call rather than the sum of all of them. Values are the raw
+    responses, so each test still reports its own API errors.
+    """
+    with fixture_cassette("generated_csf_metrics"):
+        return generate_metrics(CSF_GENERATION_METRIC_NAMES)
+
+
+@pytest.fixture(scope="class")
+def recommendations_response(real_client) -> Dict[str, Any]:
+    """Fetch CSF 2.0 recommendations once for TestRecommendationsQuality."""
+    with fixture_cassette("recommendations_response"):
+        response = real_client.post("/api/v1/ai/recommendations?framework=csf_2_0")
+
+    assert response.status_code == 200, f"API error: {response.text}"
+    return orjson.loads(response.content)
+
+
+# One chat request per mode, sent together for TestChatResponseQuality
+CHAT_MODE_MESSAGES = {
+    "explain": "What is Mean Time to Detect (MTTD) and why is it important?",
+    "report": "Generate an executive summary of our cybersecurity posture",
+    "metrics": "Create a metric to track phishing simulation click rates",
+}
+
+
+@pytest.fixture(scope="class")
+def chat_mode_responses(real_client) -> Dict[str, Any]:
+    """Send each CHAT_MODE_MESSAGES request concurrently, keyed by mode."""
+    requests = [
+        (
+            "/api/v1/ai/chat?framework=csf_2_0",
+            {
+                "content": orjson.dumps({"message": message, "mode": mode}),
+                "headers": JSON_HEADERS,
+            },
+        )
+        for mode, message in CHAT_MODE_MESSAGES.items()
+    ]
+    with fixture_cassette("chat_mode_responses"):
+        return dict(zip(CHAT_MODE_MESSAGES, gather_posts(requests)))
+
+
+# (metric name, expected CSF function, why) for TestSemanticConsistency
+SEMANTIC_FUNCTION_CASES = (
+    ("Data Encryption Coverage Rate", "pr", "Encryption is a protective control"),
+    ("SIEM Alert Processing Time", "de", "SIEM is a detection tool"),
+    ("Board Cybersecurity Briefing Frequency", "gv", "Board briefings are governance"),
+)
+
+# (metric name, allowed target units, target value range)
+SEMANTIC_UNITS_CASES = (
+    ("Endpoint Protection Coverage Percentage", ("%", "percent", "percentage"), (0, 100)),
+)
+
+
+@pytest.fixture(scope="class")
+def semantic_metrics(real_client) -> Dict[str, Any]:
+    """Generate every TestSemanticConsistency metric concurrently, keyed by name."""
+    names = [case[0] for case in SEMANTIC_FUNCTION_CASES + SEMANTIC_UNITS_CASES]
+    with fixture_cassette("semantic_metrics"):
+        return generate_metrics(names)
 
 
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
 
+FORMULA_OPERATORS = frozenset("/*%+-x×÷")
+
+# Formulas matching any of these have obvious errors
+BAD_FORMULA_PATTERNS = (
+    re.compile(r'^\s*$'),           # Empty
+    re.compile(r'^[0-9]+$'),        # Just a number
+    re.compile(r'\/ *0\b'),         # Division by zero
+    re.compile(r'× *100 *$'),       # Ends with "× 100" (should be handled by system)
+)
+
+TRAILING_TIMES_100 = re.compile(r'[×x\*]\s*100\s*$')
+
+# (pattern, group holding the JSON), tried in order
+JSON_EXTRACTION_PATTERNS = (
+    (re.compile(r'```json\s*([\s\S]*?)\s*```'), 1),
+    (re.compile(r'```\s*([\s\S]*?)\s*```'), 1),
+    (re.compile(r'\{[\s\S]*\}'), 0),
+)
+
+IMPACT_KEYWORDS = frozenset({
+    "risk", "impact", "threat", "vulnerability", "business",
+    "security", "compliance", "breach", "attack", "exposure",
+})
+FAIRNESS_KEYWORDS = frozenset({"fair", "bias", "equit", "discriminat", "disparate"})
+TIME_KEYWORDS = frozenset({"time", "speed", "quick", "fast", "hour", "minute"})
+RISK_KEYWORDS = frozenset({
+    "risk", "score", "function", "protect", "detect", "govern",
+    "identify", "respond", "recover",
+})
+
+# Checked by validate_metric_structure
+REQUIRED_METRIC_FIELDS = ("name", "description", "direction")
+VALID_DIRECTIONS = frozenset({"higher_is_better", "lower_is_better", "target_range", "binary"})
+
+
+def gather_posts(requests):
+    """POST each `(url, kwargs)` pair to the app concurrently.
+
+    Responses come back in request order. The provider calls run off the
+    event loop, so the batch takes as long as its slowest request. ASGI
+    transport skips the app's lifespan, so callers should depend on
+    `real_client` to make sure startup has already run.
+    """
+    async def send_all():
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://testserver"
+        ) as client:
+            return await asyncio.gather(
+                *(client.post(url, **kwargs) for url, kwargs in requests)
+            )
+
+    return asyncio.run(send_all())
+
+
+def generate_metrics(metric_names, framework: str = "csf_2_0") -> Dict[str, Any]:
+    """Call /ai/generate-metric for each name concurrently, keyed by name."""
+    requests = [
+        (
+            "/api/v1/ai/generate-metric",
+            {"params": {"metric_name": name, "framework": framework}},
+        )
+        for name in metric_names
+    ]
+    return dict(zip(metric_names, gather_posts(requests)))
+
+
 def is_valid_formula(formula: str) -> bool:
     """Check if a formula string makes mathematical sense."""
     if not formula or len(formula) < 3:
         return False
 
     # Should contain a division, multiplication, or percentage operation
-    has_operator = any(op in formula for op in ['/', '*', '%', '+', '-', 'x', '×', '÷'])
+    if FORMULA_OPERATORS.isdisjoint(formula):
+        return False
 
     # Should not have obvious errors
-    bad_patterns = [
-        r'^\s*$',           # Empty
-        r'^[0-9]+$',        # Just a number
-        r'\/ *0\b',         # Division by zero
-        r'× *100 *$',       # Ends with "× 100" (should be handled by system)
-    ]
-
-    for pattern in bad_patterns:
-        if re.search(pattern, formula):
-            return False
-
-    return has_operator
+    return not any(pattern.search(formula) for pattern in BAD_FORMULA_PATTERNS)
 
 
 def extract_json_from_response(content: str) -> Optional[Dict]:
@@ -121,17 +333,11 @@ def extract_json_from_response(content: str) -> Optional[Dict]:
         pass
 
     # Try extracting from code blocks
-    patterns = [
-        r'```json\s*([\s\S]*?)\s*```',
-        r'```\s*([\s\S]*?)\s*```',
-        r'\{[\s\S]*\}',
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, content)
+    for pattern, group in JSON_EXTRACTION_PATTERNS:
+        match = pattern.search(content)
         if match:
             try:
-                return json.loads(match.group(1) if '```' in pattern else match.group(0))
+                return json.loads(match.group(group))
             except json.JSONDecodeError:
                 continue
 
@@ -143,8 +349,7 @@ def validate_metric_structure(metric: Dict, framework: str = "csf_2_0") -> List[
     errors = []
 
     # Required fields
-    required_fields = ["name", "description", "direction"]
-    for field in required_fields:
+    for field in REQUIRED_METRIC_FIELDS:
         if field not in metric or not metric[field]:
             errors.append(f"Missing required field: {field}")
 
@@ -157,8 +362,7 @@ def validate_metric_structure(metric: Dict, framework: str = "csf_2_0") -> List[
         errors.append(f"Description too short: '{metric['description']}'")
 
     # Direction should be valid
-    valid_directions = ["higher_is_better", "lower_is_better", "target_range", "binary"]
-    if metric.get("direction") and metric["direction"] not in valid_directions:
+    if metric.get("direction") and metric["direction"] not in VALID_DIRECTIONS:
         errors.append(f"Invalid direction: '{metric['direction']}'")
 
     # Target value should be numeric if present
@@ -191,19 +395,17 @@ def validate_metric_structure(metric: Dict, framework: str = "csf_2_0") -> List[
 class TestCSFMetricGenerationQuality:
     """Test that AI-generated CSF 2.0 metrics are valid and sensible."""
 
-    def test_generated_metric_has_valid_csf_codes(self, real_client, csf_valid_codes):
-        """Generated metrics should map to real CSF 2.0 function/category codes."""
-        # Note: generate-metric uses query params, not JSON body
-        response = real_client.post(
-            "/api/v1/ai/generate-metric",
-            params={
-                "metric_name": "Security Awareness Training Completion Rate",
-                "framework": "csf_2_0",
-            },
-        )
+    @pytest.mark.parametrize(
+        "metric_name,expected_direction", list(CSF_GENERATION_EXPECTED_DIRECTIONS.items())
+    )
+    def test_generated_metric_quality(
+        self, generated_csf_metrics, csf_valid_codes, metric_name, expected_direction
+    ):
+        """Generated metrics should have real codes, complete fields, and a sensible direction."""
+        response = generated_csf_metrics[metric_name]
 
         assert response.status_code == 200, f"API error: {response.text}"
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data.get("success"), f"API returned failure: {data}"
         metric = data.get("metric", {})
 
@@ -218,18 +420,18 @@ class TestCSFMetricGenerationQuality:
             assert cat_code in csf_valid_codes["categories"], \
                 f"Invalid category code '{cat_code}'. Valid codes: {csf_valid_codes['categories']}"
 
-    def test_generated_metric_formula_is_valid(self, real_client):
+        errors = validate_metric_structure(metric, "csf_2_0")
+        assert not errors, f"Metric validation errors: {errors}"
+
+        assert metric.get("direction") == expected_direction, \
+            f"'{metric_name}' should be '{expected_direction}', got '{metric.get('direction')}'"
+
+    def test_generated_metric_formula_is_valid(self, generated_csf_metrics):
         """Generated metrics should have mathematically valid formulas."""
-        response = real_client.post(
-            "/api/v1/ai/generate-metric",
-            params={
-                "metric_name": "Mean Time to Detect Security Incidents",
-                "framework": "csf_2_0",
-            },
-        )
+        response = generated_csf_metrics["Mean Time to Detect Security Incidents"]
 
         assert response.status_code == 200, f"API error: {response.text}"
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data.get("success"), f"API returned failure: {data}"
         metric = data.get("metric", {})
 
@@ -238,78 +440,15 @@ class TestCSFMetricGenerationQuality:
         assert is_valid_formula(formula), f"Invalid formula: '{formula}'"
 
         # Formula should not end with "× 100" (system handles percentage display)
-        assert not re.search(r'[×x\*]\s*100\s*$', formula), \
+        assert not TRAILING_TIMES_100.search(formula), \
             f"Formula should not end with '× 100' (system handles display): '{formula}'"
 
-    def test_generated_metric_structure_is_complete(self, real_client):
-        """Generated metrics should have all required fields with valid values."""
-        response = real_client.post(
-            "/api/v1/ai/generate-metric",
-            params={
-                "metric_name": "Vulnerability Remediation SLA Compliance",
-                "framework": "csf_2_0",
-            },
-        )
-
-        assert response.status_code == 200, f"API error: {response.text}"
-        data = response.json()
-        assert data.get("success"), f"API returned failure: {data}"
-        metric = data.get("metric", {})
-
-        errors = validate_metric_structure(metric, "csf_2_0")
-        assert not errors, f"Metric validation errors: {errors}"
-
-    def test_generated_metric_direction_matches_intent(self, real_client):
-        """Direction should logically match the metric's purpose."""
-        # Test a metric where higher is clearly better
-        response = real_client.post(
-            "/api/v1/ai/generate-metric",
-            params={
-                "metric_name": "Patch Management Compliance Rate",
-                "framework": "csf_2_0",
-            },
-        )
-
-        assert response.status_code == 200, f"API error: {response.text}"
-        data = response.json()
-        assert data.get("success"), f"API returned failure: {data}"
-        metric = data.get("metric", {})
-
-        # For a patch compliance metric, higher should be better
-        assert metric.get("direction") == "higher_is_better", \
-            f"Patch compliance should be 'higher_is_better', got '{metric.get('direction')}'"
-
-    def test_generated_metric_for_lower_is_better(self, real_client):
-        """Test metric where lower values are better."""
-        response = real_client.post(
-            "/api/v1/ai/generate-metric",
-            params={
-                "metric_name": "Mean Time to Respond (MTTR)",
-                "framework": "csf_2_0",
-            },
-        )
-
-        assert response.status_code == 200, f"API error: {response.text}"
-        data = response.json()
-        assert data.get("success"), f"API returned failure: {data}"
-        metric = data.get("metric", {})
-
-        # For MTTR, lower should be better
-        assert metric.get("direction") == "lower_is_better", \
-            f"MTTR should be 'lower_is_better', got '{metric.get('direction')}'"
-
-    def test_generated_metric_has_meaningful_risk_definition(self, real_client):
+    def test_generated_metric_has_meaningful_risk_definition(self, generated_csf_metrics):
         """Generated metrics should have risk definitions explaining business impact."""
-        response = real_client.post(
-            "/api/v1/ai/generate-metric",
-            params={
-                "metric_name": "Privileged Access Management Compliance",
-                "framework": "csf_2_0",
-            },
-        )
+        response = generated_csf_metrics["Privileged Access Management Compliance"]
 
         assert response.status_code == 200, f"API error: {response.text}"
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data.get("success"), f"API returned failure: {data}"
         metric = data.get("metric", {})
 
@@ -319,9 +458,8 @@ class TestCSFMetricGenerationQuality:
             f"Risk definition should be substantive (>=50 chars), got {len(risk_def)}"
 
         # Should mention business/security impact
-        impact_keywords = ["risk", "impact", "threat", "vulnerability", "business",
-                          "security", "compliance", "breach", "attack", "exposure"]
-        has_impact_context = any(kw in risk_def.lower() for kw in impact_keywords)
+        risk_def_lower = risk_def.lower()
+        has_impact_context = any(kw in risk_def_lower for kw in IMPACT_KEYWORDS)
         assert has_impact_context, \
             f"Risk definition should explain business/security impact: '{risk_def}'"
 
@@ -344,7 +482,7 @@ class TestAIRMFMetricGenerationQuality:
         )
 
         assert response.status_code == 200, f"API error: {response.text}"
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data.get("success"), f"API returned failure: {data}"
         metric = data.get("metric", {})
 
@@ -364,7 +502,7 @@ class TestAIRMFMetricGenerationQuality:
         )
 
         assert response.status_code == 200, f"API error: {response.text}"
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data.get("success"), f"API returned failure: {data}"
         metric = data.get("metric", {})
 
@@ -375,8 +513,7 @@ class TestAIRMFMetricGenerationQuality:
 
         # Description should mention fairness/bias concepts
         desc = metric.get("description", "").lower()
-        fairness_keywords = ["fair", "bias", "equit", "discriminat", "disparate"]
-        has_fairness_context = any(kw in desc for kw in fairness_keywords)
+        has_fairness_context = any(kw in desc for kw in FAIRNESS_KEYWORDS)
         assert has_fairness_context, \
             f"Fairness metric description should mention fairness concepts: '{desc}'"
 
@@ -388,13 +525,9 @@ class TestAIRMFMetricGenerationQuality:
 class TestRecommendationsQuality:
     """Test that AI recommendations are relevant and actionable."""
 
-    def test_recommendations_have_valid_codes(self, real_client, csf_valid_codes):
+    def test_recommendations_have_valid_codes(self, recommendations_response, csf_valid_codes):
         """Recommended metrics should have valid framework codes."""
-        response = real_client.post("/api/v1/ai/recommendations?framework=csf_2_0")
-
-        assert response.status_code == 200
-        data = response.json()
-
+        data = recommendations_response
         assert data.get("success") is True, f"Recommendations failed: {data}"
 
         for rec in data.get("recommendations", []):
@@ -407,12 +540,9 @@ class TestRecommendationsQuality:
                 assert cat_code in csf_valid_codes["categories"], \
                     f"Invalid category code in recommendation: '{cat_code}'"
 
-    def test_recommendations_have_rationale(self, real_client):
+    def test_recommendations_have_rationale(self, recommendations_response):
         """Each recommendation should explain why it's needed."""
-        response = real_client.post("/api/v1/ai/recommendations?framework=csf_2_0")
-
-        assert response.status_code == 200
-        data = response.json()
+        data = recommendations_response
 
         for rec in data.get("recommendations", []):
             rationale = rec.get("rationale", "")
@@ -420,12 +550,9 @@ class TestRecommendationsQuality:
             assert len(rationale) >= 30, \
                 f"Rationale too short for '{rec.get('metric_name')}': '{rationale}'"
 
-    def test_recommendations_have_priorities(self, real_client):
+    def test_recommendations_have_priorities(self, recommendations_response):
         """Recommendations should have valid priority rankings."""
-        response = real_client.post("/api/v1/ai/recommendations?framework=csf_2_0")
-
-        assert response.status_code == 200
-        data = response.json()
+        data = recommendations_response
 
         priorities_seen = set()
         for rec in data.get("recommendations", []):
@@ -439,12 +566,9 @@ class TestRecommendationsQuality:
             assert len(priorities_seen) >= 2, \
                 "Recommendations should have varied priorities, not all the same"
 
-    def test_gap_analysis_identifies_weak_areas(self, real_client):
+    def test_gap_analysis_identifies_weak_areas(self, recommendations_response):
         """Gap analysis should identify underrepresented areas."""
-        response = real_client.post("/api/v1/ai/recommendations?framework=csf_2_0")
-
-        assert response.status_code == 200
-        data = response.json()
+        data = recommendations_response
 
         gap_analysis = data.get("gap_analysis", {})
         assert gap_analysis, "Response should include gap_analysis"
@@ -467,43 +591,32 @@ class TestRecommendationsQuality:
 class TestChatResponseQuality:
     """Test that AI chat responses are helpful and accurate."""
 
-    def test_explain_mode_provides_educational_content(self, real_client):
+    def test_explain_mode_provides_educational_content(self, chat_mode_responses):
         """Explain mode should provide educational, accurate explanations."""
-        response = real_client.post(
-            "/api/v1/ai/chat?framework=csf_2_0",
-            json={
-                "message": "What is Mean Time to Detect (MTTD) and why is it important?",
-                "mode": "explain",
-            },
-        )
+        response = chat_mode_responses["explain"]
 
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
 
         explanation = data.get("assistant_message", "")
         assert explanation, "Should return an explanation"
 
         # Should mention key concepts
-        assert "detect" in explanation.lower(), "Should explain detection"
-        assert any(kw in explanation.lower() for kw in ["time", "speed", "quick", "fast", "hour", "minute"]), \
+        explanation_lower = explanation.lower()
+        assert "detect" in explanation_lower, "Should explain detection"
+        assert any(kw in explanation_lower for kw in TIME_KEYWORDS), \
             "Should mention time aspect"
 
         # Should be educational (not just a one-liner)
         assert len(explanation) >= 200, \
             f"Explanation should be substantive (>=200 chars), got {len(explanation)}"
 
-    def test_report_mode_generates_executive_summary(self, real_client):
+    def test_report_mode_generates_executive_summary(self, chat_mode_responses):
         """Report mode should generate professional executive summaries."""
-        response = real_client.post(
-            "/api/v1/ai/chat?framework=csf_2_0",
-            json={
-                "message": "Generate an executive summary of our cybersecurity posture",
-                "mode": "report",
-            },
-        )
+        response = chat_mode_responses["report"]
 
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
 
         report = data.get("assistant_message", "")
         assert report, "Should return a report"
@@ -513,9 +626,8 @@ class TestChatResponseQuality:
         assert has_structure, "Report should have formatting/structure"
 
         # Should mention risk concepts
-        risk_keywords = ["risk", "score", "function", "protect", "detect", "govern",
-                        "identify", "respond", "recover"]
-        has_risk_context = sum(1 for kw in risk_keywords if kw in report.lower())
+        report_lower = report.lower()
+        has_risk_context = sum(1 for kw in RISK_KEYWORDS if kw in report_lower)
         assert has_risk_context >= 3, \
             f"Report should discuss risk/CSF concepts, found only {has_risk_context} keywords"
 
@@ -523,18 +635,12 @@ class TestChatResponseQuality:
         assert len(report) >= 500, \
             f"Executive report should be substantial (>=500 chars), got {len(report)}"
 
-    def test_metrics_mode_returns_actionable_response(self, real_client):
+    def test_metrics_mode_returns_actionable_response(self, chat_mode_responses):
         """Metrics mode should return structured, actionable responses."""
-        response = real_client.post(
-            "/api/v1/ai/chat?framework=csf_2_0",
-            json={
-                "message": "Create a metric to track phishing simulation click rates",
-                "mode": "metrics",
-            },
-        )
+        response = chat_mode_responses["metrics"]
 
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
 
         # Should have an assistant message explaining what was done
         message = data.get("assistant_message", "")
@@ -561,90 +667,51 @@ class TestChatResponseQuality:
 class TestSemanticConsistency:
     """Test that AI responses are semantically consistent and accurate."""
 
-    def test_protect_function_metrics_relate_to_protection(self, real_client):
-        """Metrics assigned to PROTECT should relate to protective controls."""
-        response = real_client.post(
-            "/api/v1/ai/generate-metric",
-            params={
-                "metric_name": "Data Encryption Coverage Rate",
-                "framework": "csf_2_0",
-            },
-        )
-
-        assert response.status_code == 200, f"API error: {response.text}"
-        data = response.json()
-        assert data.get("success"), f"API returned failure: {data}"
-        metric = data.get("metric", {})
-
-        # Encryption is a protective control - should map to PROTECT
-        func_code = metric.get("csf_function", "").lower()
-        assert func_code == "pr", \
-            f"Encryption metric should map to PROTECT (pr), got '{func_code}'"
-
-    def test_detect_function_metrics_relate_to_detection(self, real_client):
-        """Metrics assigned to DETECT should relate to detection capabilities."""
-        response = real_client.post(
-            "/api/v1/ai/generate-metric",
-            params={
-                "metric_name": "SIEM Alert Processing Time",
-                "framework": "csf_2_0",
-            },
-        )
-
-        assert response.status_code == 200, f"API error: {response.text}"
-        data = response.json()
-        assert data.get("success"), f"API returned failure: {data}"
-        metric = data.get("metric", {})
-
-        # SIEM is a detection tool - should map to DETECT
-        func_code = metric.get("csf_function", "").lower()
-        assert func_code == "de", \
-            f"SIEM metric should map to DETECT (de), got '{func_code}'"
-
-    def test_governance_metrics_relate_to_governance(self, real_client):
-        """Metrics assigned to GOVERN should relate to governance activities."""
-        response = real_client.post(
-            "/api/v1/ai/generate-metric",
-            params={
-                "metric_name": "Board Cybersecurity Briefing Frequency",
-                "framework": "csf_2_0",
-            },
-        )
+    @pytest.mark.parametrize(
+        "metric_name,expected_func,reason",
+        SEMANTIC_FUNCTION_CASES,
+        ids=("protect", "detect", "govern"),
+    )
+    def test_metric_maps_to_expected_function(
+        self, semantic_metrics, metric_name, expected_func, reason
+    ):
+        """Generated metrics should map to the CSF function their subject belongs to."""
+        response = semantic_metrics[metric_name]
 
         assert response.status_code == 200, f"API error: {response.text}"
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data.get("success"), f"API returned failure: {data}"
         metric = data.get("metric", {})
 
-        # Board briefings are governance - should map to GOVERN
         func_code = metric.get("csf_function", "").lower()
-        assert func_code == "gv", \
-            f"Board briefing metric should map to GOVERN (gv), got '{func_code}'"
-
-    def test_units_match_metric_type(self, real_client):
+        assert func_code == expected_func, \
+            f"{reason}: '{metric_name}' should map to '{expected_func}', got '{func_code}'"
+
+    @pytest.mark.parametrize(
+        "metric_name,allowed_units,target_range",
+        SEMANTIC_UNITS_CASES,
+        ids=("percentage",),
+    )
+    def test_units_match_metric_type(
+        self, semantic_metrics, metric_name, allowed_units, target_range
+    ):
         """Target units should be appropriate for the metric type."""
-        # Test a percentage metric
-        response = real_client.post(
-            "/api/v1/ai/generate-metric",
-            params={
-                "metric_name": "Endpoint Protection Coverage Percentage",
-                "framework": "csf_2_0",
-            },
-        )
+        response = semantic_metrics[metric_name]
 
         assert response.status_code == 200, f"API error: {response.text}"
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data.get("success"), f"API returned failure: {data}"
         metric = data.get("metric", {})
 
         units = metric.get("target_units", "").lower()
-        assert units in ["%", "percent", "percentage"], \
-            f"Percentage metric should have percentage units, got '{units}'"
+        assert units in allowed_units, \
+            f"'{metric_name}' should have units in {allowed_units}, got '{units}'"
 
         target = metric.get("target_value")
         if target is not None:
-            assert 0 <= float(target) <= 100, \
-                f"Percentage target should be 0-100, got {target}"
+            low, high = target_range
+            assert low <= float(target) <= high, \
+                f"'{metric_name}' target should be {low}-{high}, got {target}"
 
 
 # =============================================================================
@@ -656,9 +723,10 @@ class TestAIErrorRecovery:
 
     def test_handles_ambiguous_input_gracefully(self, real_client):
         """Should handle vague/ambiguous requests without crashing."""
-        response = real_client.post(
+        response = post_json(
+            real_client,
             "/api/v1/ai/chat?framework=csf_2_0",
-            json={
+            {
                 "message": "make it better",
                 "mode": "explain",
             },
@@ -669,7 +737,7 @@ class TestAIErrorRecovery:
             f"Unexpected status {response.status_code}: {response.text}"
 
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             # Should have some response (not empty)
             assert data.get("assistant_message"), "Should provide some response"
 
@@ -6,10 +6,12 @@ the system prompts are tailored to the mode, and edge cases
 """
 
 import json
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
+import orjson
 import pytest
 
+from src.routers import ai as ai_router
 from src.services.ai.base_provider import (
     AIResponse as ProviderAIResponse,
     ProviderType,
@@ -22,7 +24,21 @@ from .fixtures.mock_responses import (
     RECOMMENDATIONS_RESPONSE,
     REPORT_MODE_RESPONSE,
 )
-from .fixtures.sample_metrics import create_sample_function_scores, create_sample_metrics
+
+
+def provider_response(content):
+    """Build the ProviderAIResponse the mock provider returns for `content`."""
+    return ProviderAIResponse(
+        content=content,
+        model_used="claude-sonnet-4-5-20250929",
+        provider=ProviderType.ANTHROPIC,
+    )
+
+
+# The router only reads provider responses, so tests can share these
+EXPLAIN_PROVIDER_RESPONSE = provider_response(EXPLAIN_MODE_RESPONSE)
+REPORT_PROVIDER_RESPONSE = provider_response(REPORT_MODE_RESPONSE)
+MALFORMED_PROVIDER_RESPONSE = provider_response(MALFORMED_JSON_RESPONSE)
 
 
 # =============================================================================
@@ -46,7 +62,7 @@ class TestMetricsMode:
         )
 
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
 
         assert "assistant_message" in data
         assert "actions" in data
@@ -67,7 +83,7 @@ class TestMetricsMode:
         )
 
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
 
         assert data["needs_confirmation"] is True
         assert isinstance(data["actions"], list)
@@ -90,7 +106,7 @@ class TestMetricsMode:
         )
 
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
 
         # The parsed JSON response from mock has metric with function_code
         if data["actions"]:
@@ -101,22 +117,13 @@ class TestMetricsMode:
                 # In the response the raw JSON from the AI includes function_code
                 assert data["assistant_message"]  # Has explanatory message
 
-    def test_metrics_mode_with_context(self, client_with_provider):
+    def test_metrics_mode_with_context(self, client_with_provider, sample_metrics):
         """When include_existing_metrics is set, existing metrics should be
         included in the AI prompt context."""
         client, provider, db = client_with_provider
 
         # Set up mock to return existing metrics when queried
-        sample_metrics = create_sample_metrics()
-        query_chain = MagicMock()
-        query_chain.filter.return_value = query_chain
-        query_chain.limit.return_value = query_chain
-        query_chain.all.return_value = sample_metrics
-        query_chain.first.return_value = None
-        query_chain.offset.return_value = query_chain
-        query_chain.order_by.return_value = query_chain
-        query_chain.count.return_value = 0
-        db.query.return_value = query_chain
+        db.query.return_value.all.return_value = sample_metrics
 
         response = client.post(
             "/api/v1/ai/chat?framework=csf_2_0",
@@ -141,11 +148,7 @@ class TestMetricsMode:
         client, provider, db = client_with_provider
 
         # Configure provider to return non-JSON text
-        provider.generate_response.return_value = ProviderAIResponse(
-            content=MALFORMED_JSON_RESPONSE,
-            model_used="claude-sonnet-4-5-20250929",
-            provider=ProviderType.ANTHROPIC,
-        )
+        provider.generate_response.return_value = MALFORMED_PROVIDER_RESPONSE
 
         response = client.post(
             "/api/v1/ai/chat?framework=csf_2_0",
@@ -156,7 +159,7 @@ class TestMetricsMode:
         )
 
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
 
         # Fallback: raw text becomes assistant_message, empty actions
         assert data["assistant_message"] == MALFORMED_JSON_RESPONSE
@@ -176,11 +179,7 @@ class TestExplainMode:
         client, provider, db = client_with_provider
 
         # Configure provider to return explanation text
-        provider.generate_response.return_value = ProviderAIResponse(
-            content=EXPLAIN_MODE_RESPONSE,
-            model_used="claude-sonnet-4-5-20250929",
-            provider=ProviderType.ANTHROPIC,
-        )
+        provider.generate_response.return_value = EXPLAIN_PROVIDER_RESPONSE
 
         response = client.post(
             "/api/v1/ai/chat?framework=csf_2_0",
@@ -191,7 +190,7 @@ class TestExplainMode:
         )
 
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
 
         assert "assistant_message" in data
         assert len(data["assistant_message"]) > 50
@@ -205,11 +204,7 @@ class TestExplainMode:
             "The gap-to-target scoring methodology compares each metric's current "
             "value against its target value to calculate a percentage score."
         )
-        provider.generate_response.return_value = ProviderAIResponse(
-            content=explanation,
-            model_used="claude-sonnet-4-5-20250929",
-            provider=ProviderType.ANTHROPIC,
-        )
+        provider.generate_response.return_value = provider_response(explanation)
 
         response = client.post(
             "/api/v1/ai/chat?framework=csf_2_0",
@@ -220,18 +215,14 @@ class TestExplainMode:
         )
 
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert "gap-to-target" in data["assistant_message"].lower()
 
     def test_explain_mode_no_actions(self, client_with_provider):
         """Explain mode should never return actions -- only text."""
         client, provider, db = client_with_provider
 
-        provider.generate_response.return_value = ProviderAIResponse(
-            content=EXPLAIN_MODE_RESPONSE,
-            model_used="claude-sonnet-4-5-20250929",
-            provider=ProviderType.ANTHROPIC,
-        )
+        provider.generate_response.return_value = EXPLAIN_PROVIDER_RESPONSE
 
         response = client.post(
             "/api/v1/ai/chat?framework=csf_2_0",
@@ -242,7 +233,7 @@ class TestExplainMode:
         )
 
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
 
         assert data["actions"] == []
         assert data["needs_confirmation"] is False
@@ -252,59 +243,55 @@ class TestExplainMode:
 # REPORT MODE TESTS
 # =============================================================================
 
+@pytest.fixture
+def report_scoring(monkeypatch, sample_function_scores):
+    """Stub the scoring functions report mode uses to build its context."""
+    monkeypatch.setattr(
+        ai_router,
+        "compute_function_scores",
+        MagicMock(return_value=sample_function_scores),
+    )
+    monkeypatch.setattr(
+        ai_router, "get_metrics_needing_attention", MagicMock(return_value=[])
+    )
+
+
 class TestReportMode:
     """Tests for the 'report' mode of the /ai/chat endpoint."""
 
-    def test_executive_report_generation(self, client_with_provider):
+    def test_executive_report_generation(self, client_with_provider, report_scoring):
         """Report mode should generate an executive-style narrative."""
         client, provider, db = client_with_provider
 
-        provider.generate_response.return_value = ProviderAIResponse(
-            content=REPORT_MODE_RESPONSE,
-            model_used="claude-sonnet-4-5-20250929",
-            provider=ProviderType.ANTHROPIC,
-        )
-
-        # Mock the scoring functions used by report mode
-        scores = create_sample_function_scores()
-        with patch("src.routers.ai.compute_function_scores", return_value=scores), \
-             patch("src.routers.ai.get_metrics_needing_attention", return_value=[]):
+        provider.generate_response.return_value = REPORT_PROVIDER_RESPONSE
 
-            response = client.post(
-                "/api/v1/ai/chat?framework=csf_2_0",
-                json={
-                    "message": "Generate an executive risk report",
-                    "mode": "report",
-                },
-            )
+        response = client.post(
+            "/api/v1/ai/chat?framework=csf_2_0",
+            json={
+                "message": "Generate an executive risk report",
+                "mode": "report",
+            },
+        )
 
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
 
         assert "assistant_message" in data
         assert len(data["assistant_message"]) > 100
 
-    def test_report_includes_risk_context(self, client_with_provider):
+    def test_report_includes_risk_context(self, client_with_provider, report_scoring):
         """Report should include context about risk levels passed to the AI."""
         client, provider, db = client_with_provider
 
-        provider.generate_response.return_value = ProviderAIResponse(
-            content=REPORT_MODE_RESPONSE,
-            model_used="claude-sonnet-4-5-20250929",
-            provider=ProviderType.ANTHROPIC,
-        )
+        provider.generate_response.return_value = REPORT_PROVIDER_RESPONSE
 
-        scores = create_sample_function_scores()
-        with patch("src.routers.ai.compute_function_scores", return_value=scores), \
-             patch("src.routers.ai.get_metrics_needing_attention", return_value=[]):
-
-            response = client.post(
-                "/api/v1/ai/chat?framework=csf_2_0",
-                json={
-                    "message": "Give me a risk report",
-                    "mode": "report",
-                },
-            )
+        response = client.post(
+            "/api/v1/ai/chat?framework=csf_2_0",
+            json={
+                "message": "Give me a risk report",
+                "mode": "report",
+            },
+        )
 
         assert response.status_code == 200
 
@@ -315,30 +302,22 @@ class TestReportMode:
         assert "Context:" in user_content
         assert "function_scores" in user_content
 
-    def test_report_mode_no_actions(self, client_with_provider):
+    def test_report_mode_no_actions(self, client_with_provider, report_scoring):
         """Report mode should never return actions."""
         client, provider, db = client_with_provider
 
-        provider.generate_response.return_value = ProviderAIResponse(
-            content=REPORT_MODE_RESPONSE,
-            model_used="claude-sonnet-4-5-20250929",
-            provider=ProviderType.ANTHROPIC,
-        )
-
-        scores = create_sample_function_scores()
-        with patch("src.routers.ai.compute_function_scores", return_value=scores), \
-             patch("src.routers.ai.get_metrics_needing_attention", return_value=[]):
+        provider.generate_response.return_value = REPORT_PROVIDER_RESPONSE
 
-            response = client.post(
-                "/api/v1/ai/chat?framework=csf_2_0",
-                json={
-                    "message": "Report on our security posture",
-                    "mode": "report",
-                },
-            )
+        response = client.post(
+            "/api/v1/ai/chat?framework=csf_2_0",
+            json={
+                "message": "Report on our security posture",
+                "mode": "report",
+            },
+        )
 
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data["actions"] == []
         assert data["needs_confirmation"] is False
 
@@ -348,6 +327,37 @@ class TestReportMode:
 # but recommendations are tested through the dedicated endpoint)
 # =============================================================================
 
+RECOMMENDATIONS_WITH_GAPS = {
+    "success": True,
+    "framework_code": "csf_2_0",
+    "recommendations": [
+        {
+            "metric_name": "Phishing Simulation Click Rate",
+            "function_code": "pr",
+            "category_code": "PR.AT",
+            "priority": 1,
+        }
+    ],
+    "gap_analysis": {
+        "underrepresented_functions": ["de", "rc"],
+        "coverage_percentage": 75.0,
+    },
+}
+
+RECOMMENDATIONS_WITH_PRIORITIES = {
+    "success": True,
+    "framework_code": "csf_2_0",
+    "recommendations": [
+        {"metric_name": "Test Metric", "priority": 1},
+        {"metric_name": "Another Metric", "priority": 2},
+    ],
+    "gap_analysis": {
+        "underrepresented_functions": [],
+        "coverage_percentage": 90.0,
+    },
+}
+
+
 class TestRecommendationsMode:
     """Tests for recommendations delivered through the /ai/chat endpoint.
 
@@ -356,61 +366,26 @@ class TestRecommendationsMode:
     /ai/recommendations. These tests verify the dedicated endpoint behavior.
     """
 
-    def test_recommendations_with_gaps(self, client_with_provider):
-        """POST /ai/recommendations should return structured recommendations."""
+    @pytest.mark.parametrize(
+        "result",
+        [RECOMMENDATIONS_WITH_GAPS, RECOMMENDATIONS_WITH_PRIORITIES],
+        ids=["with_gaps", "with_priorities"],
+    )
+    def test_recommendations_endpoint(self, client_with_provider, monkeypatch, result):
+        """POST /ai/recommendations should return prioritized recommendations."""
         client, provider, db = client_with_provider
 
-        result = {
-            "success": True,
-            "framework_code": "csf_2_0",
-            "recommendations": [
-                {
-                    "metric_name": "Phishing Simulation Click Rate",
-                    "function_code": "pr",
-                    "category_code": "PR.AT",
-                    "priority": 1,
-                }
-            ],
-            "gap_analysis": {
-                "underrepresented_functions": ["de", "rc"],
-                "coverage_percentage": 75.0,
-            },
-        }
-
-        with patch("src.routers.ai.generate_metric_recommendations",
-                    new_callable=AsyncMock,
-                    return_value=result):
-            response = client.post("/api/v1/ai/recommendations?framework=csf_2_0")
+        monkeypatch.setattr(
+            ai_router,
+            "generate_metric_recommendations",
+            AsyncMock(return_value=result),
+        )
+        response = client.post("/api/v1/ai/recommendations?framework=csf_2_0")
 
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data["success"] is True
         assert len(data["recommendations"]) > 0
 
-    def test_recommendations_include_priority(self, client_with_provider):
-        """Recommendations should include priority rankings."""
-        client, provider, db = client_with_provider
-
-        result = {
-            "success": True,
-            "framework_code": "csf_2_0",
-            "recommendations": [
-                {"metric_name": "Test Metric", "priority": 1},
-                {"metric_name": "Another Metric", "priority": 2},
-            ],
-            "gap_analysis": {
-                "underrepresented_functions": [],
-                "coverage_percentage": 90.0,
-            },
-        }
-
-        with patch("src.routers.ai.generate_metric_recommendations",
-                    new_callable=AsyncMock,
-                    return_value=result):
-            response = client.post("/api/v1/ai/recommendations?framework=csf_2_0")
-
-        assert response.status_code == 200
-        data = response.json()
-
         for rec in data["recommendations"]:
             assert "priority" in rec
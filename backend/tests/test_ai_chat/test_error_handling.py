@@ -11,10 +11,13 @@ Validates proper error responses for:
 import os
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import orjson
 import pytest
 from fastapi import HTTPException
+from pydantic import ValidationError
 
 from src.routers.ai import get_system_prompt_for_mode
+from src.schemas import AIChatRequest
 from src.services.ai.base_provider import (
     AIProviderError,
     AIResponse as ProviderAIResponse,
@@ -23,6 +26,12 @@ from src.services.ai.base_provider import (
     RateLimitError,
 )
 
+# Chat request bodies per mode, shared by the provider failure cases
+CHAT_BODIES = {
+    mode: {"message": "Create a metric", "mode": mode}
+    for mode in ("metrics", "explain", "report")
+}
+
 
 # =============================================================================
 # ERROR HANDLING TESTS
@@ -45,87 +54,63 @@ class TestErrorHandling:
         )
 
         assert response.status_code in (403, 503)
-        data = response.json()
+        data = orjson.loads(response.content)
         assert "detail" in data
 
-    def test_provider_api_error(self, client_with_provider):
-        """When the AI provider raises an error, a 503 should be returned."""
+    @pytest.mark.parametrize(
+        "mode,error,status,detail_sub",
+        [
+            pytest.param(
+                "metrics",
+                AIProviderError(
+                    "Service temporarily unavailable", provider=ProviderType.ANTHROPIC
+                ),
+                503,
+                "provider error",
+                id="api_error",
+            ),
+            pytest.param(
+                "explain",
+                AuthenticationError("Invalid API key", provider=ProviderType.ANTHROPIC),
+                503,
+                None,
+                id="authentication_error",
+            ),
+            pytest.param(
+                "report",
+                RateLimitError(
+                    "Rate limit exceeded. Retry after 30 seconds.",
+                    provider=ProviderType.ANTHROPIC,
+                    retry_after=30,
+                ),
+                503,
+                None,
+                id="rate_limit_error",
+            ),
+            pytest.param(
+                "explain",
+                RuntimeError("Unexpected internal error"),
+                500,
+                None,
+                id="generic_exception",
+            ),
+        ],
+    )
+    def test_provider_exception_mapping(
+        self, client_with_provider, mode, error, status, detail_sub
+    ):
+        """Provider failures should map to 503, unexpected exceptions to 500."""
         client, provider, db = client_with_provider
 
-        # Make the provider raise an AIProviderError
-        provider.generate_response.side_effect = AIProviderError(
-            "Service temporarily unavailable",
-            provider=ProviderType.ANTHROPIC,
-        )
-
-        response = client.post(
-            "/api/v1/ai/chat?framework=csf_2_0",
-            json={
-                "message": "Create a metric",
-                "mode": "metrics",
-            },
-        )
-
-        assert response.status_code == 503
-        data = response.json()
-        assert "provider error" in data["detail"].lower()
+        provider.generate_response.side_effect = error
 
-    def test_provider_authentication_error(self, client_with_provider):
-        """When provider credentials are invalid, a 503 should be returned."""
-        client, provider, db = client_with_provider
-
-        provider.generate_response.side_effect = AuthenticationError(
-            "Invalid API key",
-            provider=ProviderType.ANTHROPIC,
-        )
+        response = client.post("/api/v1/ai/chat?framework=csf_2_0", json=CHAT_BODIES[mode])
 
-        response = client.post(
-            "/api/v1/ai/chat?framework=csf_2_0",
-            json={
-                "message": "Explain MFA",
-                "mode": "explain",
-            },
-        )
-
-        assert response.status_code == 503
-
-    def test_provider_rate_limit_error(self, client_with_provider):
-        """When the provider hits rate limits, a 503 should be returned."""
-        client, provider, db = client_with_provider
-
-        provider.generate_response.side_effect = RateLimitError(
-            "Rate limit exceeded. Retry after 30 seconds.",
-            provider=ProviderType.ANTHROPIC,
-            retry_after=30,
-        )
-
-        response = client.post(
-            "/api/v1/ai/chat?framework=csf_2_0",
-            json={
-                "message": "Generate a report",
-                "mode": "report",
-            },
-        )
-
-        assert response.status_code == 503
-
-    def test_provider_generic_exception(self, client_with_provider):
-        """When an unexpected exception occurs, a 500 should be returned."""
-        client, provider, db = client_with_provider
-
-        provider.generate_response.side_effect = RuntimeError("Unexpected internal error")
-
-        response = client.post(
-            "/api/v1/ai/chat?framework=csf_2_0",
-            json={
-                "message": "Something",
-                "mode": "explain",
-            },
-        )
-
-        assert response.status_code == 500
-        data = response.json()
+        assert response.status_code == status
+        data = orjson.loads(response.content)
         assert "detail" in data
+        if detail_sub:
+            assert detail_sub in data["detail"].lower()
 
     def test_invalid_framework_code(self, client_with_provider):
         """An invalid framework code should return a 400 error."""
@@ -140,64 +125,34 @@ class TestErrorHandling:
         )
 
         assert response.status_code == 400
-        data = response.json()
+        data = orjson.loads(response.content)
         assert "invalid framework" in data["detail"].lower()
 
-    def test_empty_message(self, client_with_provider):
-        """An empty message should be rejected by Pydantic validation (422)."""
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            pytest.param({"message": "", "mode": "metrics"}, id="empty_message"),
+            pytest.param({"mode": "metrics"}, id="missing_message"),
+            pytest.param({"message": "Something", "mode": "invalid_mode"}, id="invalid_mode"),
+            # max_length is 2000
+            pytest.param({"message": "x" * 2001, "mode": "metrics"}, id="message_too_long"),
+        ],
+    )
+    def test_invalid_payload_rejected(self, payload):
+        """Malformed chat requests should fail AIChatRequest validation."""
+        with pytest.raises(ValidationError):
+            AIChatRequest.model_validate(payload)
+
+    def test_invalid_payload_returns_422(self, client_with_provider):
+        """The chat endpoint should answer a request that fails validation with 422."""
         client, provider, db = client_with_provider
 
         response = client.post(
-            "/api/v1/ai/chat?framework=csf_2_0",
-            json={
-                "message": "",
-                "mode": "metrics",
-            },
-        )
-
-        assert response.status_code == 422
-
-    def test_missing_required_fields(self, client_with_provider):
-        """A request missing required fields should return 422."""
-        client, provider, db = client_with_provider
-
-        # Missing 'message' field entirely
-        response = client.post(
-            "/api/v1/ai/chat?framework=csf_2_0",
-            json={
-                "mode": "metrics",
-            },
-        )
-
-        assert response.status_code == 422
-
-    def test_invalid_mode(self, client_with_provider):
-        """An invalid mode should be rejected by Pydantic validation (422)."""
-        client, provider, db = client_with_provider
-
-        response = client.post(
-            "/api/v1/ai/chat?framework=csf_2_0",
-            json={
-                "message": "Something",
-                "mode": "invalid_mode",
-            },
-        )
-
-        assert response.status_code == 422
-
-    def test_message_too_long(self, client_with_provider):
-        """A message exceeding max_length should be rejected (422)."""
-        client, provider, db = client_with_provider
-
-        response = client.post(
-            "/api/v1/ai/chat?framework=csf_2_0",
-            json={
-                "message": "x" * 2001,  # max_length is 2000
-                "mode": "metrics",
-            },
+            "/api/v1/ai/chat?framework=csf_2_0", json={"message": "", "mode": "metrics"}
         )
 
         assert response.status_code == 422
+        provider.generate_response.assert_not_called()
 
 
 # =============================================================================
@@ -207,27 +162,39 @@ class TestErrorHandling:
 class TestMultiFrameworkContext:
     """Tests for framework-specific system prompts and context."""
 
-    def test_csf_framework_context(self):
-        """CSF 2.0 system prompt should contain CSF-specific function names."""
-        prompt = get_system_prompt_for_mode("metrics", "csf_2_0")
-
-        assert "NIST CSF 2.0" in prompt
-        assert "GOVERN" in prompt
-        assert "IDENTIFY" in prompt
-        assert "PROTECT" in prompt
-        assert "DETECT" in prompt
-        assert "RESPOND" in prompt
-        assert "RECOVER" in prompt
-
-    def test_ai_rmf_framework_context(self):
-        """AI RMF system prompt should contain AI RMF-specific function names."""
-        prompt = get_system_prompt_for_mode("metrics", "ai_rmf")
-
-        assert "AI RMF" in prompt
-        assert "GOVERN" in prompt
-        assert "MAP" in prompt
-        assert "MEASURE" in prompt
-        assert "MANAGE" in prompt
+    @pytest.mark.parametrize(
+        "mode,framework,required",
+        [
+            pytest.param(
+                "metrics", "csf_2_0",
+                ["NIST CSF 2.0", "GOVERN", "IDENTIFY", "PROTECT", "DETECT", "RESPOND", "RECOVER"],
+                id="csf_framework_context",
+            ),
+            pytest.param(
+                "metrics", "ai_rmf",
+                ["AI RMF", "GOVERN", "MAP", "MEASURE", "MANAGE"],
+                id="ai_rmf_framework_context",
+            ),
+            # An unknown mode falls back to a generic assistant prompt
+            pytest.param(
+                "unknown_mode", "csf_2_0",
+                ["cybersecurity", "NIST CSF 2.0"],
+                id="unknown_mode_uses_default",
+            ),
+            # An unknown framework code falls back to CSF 2.0 context
+            pytest.param(
+                "metrics", "nonexistent_framework",
+                ["NIST CSF 2.0"],
+                id="unknown_framework_uses_csf_default",
+            ),
+        ],
+    )
+    def test_prompt_contains_framework_terms(self, mode, framework, required):
+        """System prompts should name the framework and its functions."""
+        prompt = get_system_prompt_for_mode(mode, framework)
+
+        missing = [term for term in required if term not in prompt]
+        assert not missing, f"Prompt for ({mode}, {framework}) is missing {missing}"
 
     def test_explain_mode_prompt_content(self):
         """Explain mode prompt should focus on business language."""
@@ -250,56 +217,36 @@ class TestMultiFrameworkContext:
         assert "coverage gaps" in prompt.lower() or "gap" in prompt.lower()
         assert "recommend" in prompt.lower()
 
-    def test_unknown_mode_uses_default(self):
-        """An unknown mode should fall back to a generic assistant prompt."""
-        prompt = get_system_prompt_for_mode("unknown_mode", "csf_2_0")
-
-        assert "cybersecurity" in prompt.lower()
-        assert "NIST CSF 2.0" in prompt
-
-    def test_unknown_framework_uses_csf_default(self):
-        """An unknown framework code should fall back to CSF 2.0 context."""
-        prompt = get_system_prompt_for_mode("metrics", "nonexistent_framework")
-
-        # Should fall back to csf_2_0
-        assert "NIST CSF 2.0" in prompt
-
-    def test_chat_with_csf_framework(self, client_with_provider):
-        """The /ai/chat endpoint should pass the correct framework to the system prompt."""
-        client, provider, db = client_with_provider
-
-        response = client.post(
-            "/api/v1/ai/chat?framework=csf_2_0",
-            json={
-                "message": "Create a metric for asset inventory",
-                "mode": "metrics",
-            },
-        )
-
-        assert response.status_code == 200
-
-        # Check that the system prompt passed to the provider contains CSF content
-        call_args = provider.generate_response.call_args
-        system_prompt = call_args.kwargs.get("system_prompt", "")
-        assert "NIST CSF 2.0" in system_prompt
-
-    def test_chat_with_ai_rmf_framework(self, client_with_provider):
-        """The /ai/chat endpoint should pass AI RMF context when framework=ai_rmf."""
+    @pytest.mark.parametrize(
+        "framework,message,expected",
+        [
+            pytest.param(
+                "csf_2_0", "Create a metric for asset inventory", "NIST CSF 2.0",
+                id="csf_2_0",
+            ),
+            pytest.param(
+                "ai_rmf", "Create a metric for AI model bias detection", "AI RMF",
+                id="ai_rmf",
+            ),
+        ],
+    )
+    def test_chat_passes_framework_to_prompt(
+        self, client_with_provider, framework, message, expected
+    ):
+        """The /ai/chat endpoint should build the system prompt for the requested framework."""
         client, provider, db = client_with_provider
 
         response = client.post(
-            "/api/v1/ai/chat?framework=ai_rmf",
-            json={
-                "message": "Create a metric for AI model bias detection",
-                "mode": "metrics",
-            },
+            f"/api/v1/ai/chat?framework={framework}",
+            json={"message": message, "mode": "metrics"},
         )
 
         assert response.status_code == 200
 
+        # Check that the system prompt passed to the provider names the framework
         call_args = provider.generate_response.call_args
         system_prompt = call_args.kwargs.get("system_prompt", "")
-        assert "AI RMF" in system_prompt
+        assert expected in system_prompt
 
 
 # =============================================================================
@@ -314,7 +261,7 @@ class TestAIStatus:
         response = client.get("/api/v1/ai/status")
 
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
 
         assert data["available"] is False
         assert "supported_providers" in data
@@ -322,25 +269,19 @@ class TestAIStatus:
         assert "supported_frameworks" in data
 
     def test_status_with_provider(self, client_with_provider):
-        """When a provider is configured, status should show available=True."""
+        """With a provider configured, status should show available=True and
+        list all supported providers, modes, and frameworks."""
         client, provider, db = client_with_provider
 
         response = client.get("/api/v1/ai/status")
 
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
 
         assert data["available"] is True
         assert data["provider"] == "anthropic"
         assert data["model"] is not None
 
-    def test_status_supported_lists(self, client_with_provider):
-        """Status should list all supported providers, modes, and frameworks."""
-        client, provider, db = client_with_provider
-
-        response = client.get("/api/v1/ai/status")
-        data = response.json()
-
         assert "anthropic" in data["supported_providers"]
         assert "openai" in data["supported_providers"]
         assert "together" in data["supported_providers"]
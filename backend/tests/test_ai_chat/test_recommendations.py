@@ -7,115 +7,198 @@ Validates:
 - GET /ai/recommendations/distribution - Metric distribution analysis
 """
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
 
+import orjson
 import pytest
 
+from src.routers import ai as ai_router
 from src.services.ai.base_provider import AIProviderError, ProviderType
 
 
+# Canned service results. The router adds "ai_available" to the dicts it
+# returns, which is idempotent, so tests can share them.
+RECOMMENDATIONS_RESULT = {
+    "success": True,
+    "framework_code": "csf_2_0",
+    "recommendations": [
+        {
+            "metric_name": "Phishing Click Rate",
+            "description": "Percentage of employees clicking phishing simulations",
+            "function_code": "pr",
+            "category_code": "PR.AT",
+            "priority": 1,
+            "rationale": "No training effectiveness metrics exist",
+            "expected_impact": "Visibility into human risk",
+        },
+        {
+            "metric_name": "Vendor Risk Assessment Coverage",
+            "description": "Percentage of critical vendors assessed",
+            "function_code": "gv",
+            "category_code": "GV.SC",
+            "priority": 2,
+            "rationale": "Supply chain risk gap",
+            "expected_impact": "Better third-party risk visibility",
+        },
+    ],
+    "gap_analysis": {
+        "underrepresented_functions": ["de", "rc"],
+        "coverage_percentage": 75.0,
+        "overall_assessment": "Coverage needs improvement in DETECT and RECOVER.",
+    },
+}
+
+
+SINGLE_RECOMMENDATION_RESULT = {
+    "success": True,
+    "framework_code": "csf_2_0",
+    "recommendations": [{"metric_name": "Single Recommendation"}],
+    "gap_analysis": {"underrepresented_functions": [], "coverage_percentage": 90.0},
+}
+
+
+RECOMMENDATIONS_PARSE_FAILURE = {
+    "success": False,
+    "error": "Failed to parse AI response",
+}
+
+
+COVERAGE_GAPS = {
+    "framework_code": "csf_2_0",
+    "total_functions": 6,
+    "functions_with_metrics": 4,
+    "gaps": [
+        {
+            "function_code": "de",
+            "function_name": "Detect",
+            "categories_without_metrics": ["DE.AE"],
+            "metric_count": 2,
+        },
+        {
+            "function_code": "rc",
+            "function_name": "Recover",
+            "categories_without_metrics": ["RC.CO"],
+            "metric_count": 1,
+        },
+    ],
+}
+
+
+DETECT_SUGGESTIONS_RESULT = {
+    "success": True,
+    "suggestions": [
+        {
+            "metric_name": "Alert Triage Time",
+            "function_code": "de",
+            "category_code": "DE.AE",
+            "description": "Average time to triage security alerts",
+        }
+    ],
+}
+
+
+SUGGESTIONS_FAILURE = {
+    "success": False,
+    "error": "AI generation failed",
+}
+
+
+METRIC_DISTRIBUTION = {
+    "framework_code": "csf_2_0",
+    "total_metrics": 208,
+    "distribution": {
+        "gv": {"count": 36, "percentage": 17.3},
+        "id": {"count": 35, "percentage": 16.8},
+        "pr": {"count": 44, "percentage": 21.2},
+        "de": {"count": 32, "percentage": 15.4},
+        "rs": {"count": 30, "percentage": 14.4},
+        "rc": {"count": 31, "percentage": 14.9},
+    },
+}
+
+
+@pytest.fixture
+def recommendation_services(monkeypatch):
+    """Replace the recommendation services the router calls with mocks.
+
+    Tests set `return_value` on the mock for the endpoint they exercise;
+    monkeypatch restores the real services afterwards.
+    """
+    services = SimpleNamespace(
+        recommend=AsyncMock(),
+        suggest=AsyncMock(),
+        gaps=MagicMock(),
+        distribution=MagicMock(),
+    )
+    monkeypatch.setattr(ai_router, "generate_metric_recommendations", services.recommend)
+    monkeypatch.setattr(ai_router, "suggest_metrics_for_gap", services.suggest)
+    monkeypatch.setattr(ai_router, "get_coverage_gaps", services.gaps)
+    monkeypatch.setattr(ai_router, "get_metric_distribution", services.distribution)
+    return services
+
+
 class TestGetRecommendationsEndpoint:
     """Tests for the POST /ai/recommendations endpoint."""
 
-    def test_get_recommendations_endpoint(self, client_with_provider):
+    def test_get_recommendations_endpoint(self, client_with_provider, recommendation_services):
         """Successful request should return recommendations with gap analysis."""
         client, provider, db = client_with_provider
 
-        result = {
-            "success": True,
-            "framework_code": "csf_2_0",
-            "recommendations": [
-                {
-                    "metric_name": "Phishing Click Rate",
-                    "description": "Percentage of employees clicking phishing simulations",
-                    "function_code": "pr",
-                    "category_code": "PR.AT",
-                    "priority": 1,
-                    "rationale": "No training effectiveness metrics exist",
-                    "expected_impact": "Visibility into human risk",
-                },
-                {
-                    "metric_name": "Vendor Risk Assessment Coverage",
-                    "description": "Percentage of critical vendors assessed",
-                    "function_code": "gv",
-                    "category_code": "GV.SC",
-                    "priority": 2,
-                    "rationale": "Supply chain risk gap",
-                    "expected_impact": "Better third-party risk visibility",
-                },
-            ],
-            "gap_analysis": {
-                "underrepresented_functions": ["de", "rc"],
-                "coverage_percentage": 75.0,
-                "overall_assessment": "Coverage needs improvement in DETECT and RECOVER.",
-            },
-        }
+        recommendation_services.recommend.return_value = RECOMMENDATIONS_RESULT
 
-        with patch(
-            "src.routers.ai.generate_metric_recommendations",
-            new_callable=AsyncMock,
-            return_value=result,
-        ):
-            response = client.post("/api/v1/ai/recommendations?framework=csf_2_0")
+        response = client.post("/api/v1/ai/recommendations?framework=csf_2_0")
 
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
 
         assert data["success"] is True
         assert len(data["recommendations"]) == 2
         assert "gap_analysis" in data
         assert data["gap_analysis"]["coverage_percentage"] == 75.0
 
-    def test_recommendations_with_max_count(self, client_with_provider):
+    def test_recommendations_with_max_count(self, client_with_provider, recommendation_services):
         """max_recommendations parameter should be passed through."""
         client, provider, db = client_with_provider
 
-        result = {
-            "success": True,
-            "framework_code": "csf_2_0",
-            "recommendations": [{"metric_name": "Single Recommendation"}],
-            "gap_analysis": {"underrepresented_functions": [], "coverage_percentage": 90.0},
-        }
+        recommendation_services.recommend.return_value = SINGLE_RECOMMENDATION_RESULT
 
-        with patch(
-            "src.routers.ai.generate_metric_recommendations",
-            new_callable=AsyncMock,
-            return_value=result,
-        ) as mock_gen:
-            response = client.post(
-                "/api/v1/ai/recommendations?framework=csf_2_0&max_recommendations=3"
-            )
+        response = client.post(
+            "/api/v1/ai/recommendations?framework=csf_2_0&max_recommendations=3"
+        )
 
         assert response.status_code == 200
         # Verify the max_recommendations parameter was passed through
-        mock_gen.assert_called_once()
-        call_args = mock_gen.call_args
+        recommendation_services.recommend.assert_called_once()
+        call_args = recommendation_services.recommend.call_args
         assert call_args[0][1] == "csf_2_0"  # framework
         assert call_args[0][2] == 3  # max_recommendations
 
-    def test_recommendations_no_provider(self, client, mock_db):
-        """When no AI provider is available, should return 503."""
-        response = client.post("/api/v1/ai/recommendations?framework=csf_2_0")
+    @pytest.mark.parametrize(
+        "url",
+        [
+            pytest.param("/api/v1/ai/recommendations?framework=csf_2_0", id="recommendations"),
+            pytest.param("/api/v1/ai/recommendations/suggest?framework=csf_2_0", id="suggest"),
+        ],
+    )
+    def test_recommendations_no_provider(self, client, mock_db, url):
+        """Without an AI provider, recommendation endpoints should report
+        ai_available=False in a 200 response rather than fail."""
+        response = client.post(url)
 
-        assert response.status_code == 503
-        data = response.json()
-        assert "not available" in data["detail"].lower()
+        assert response.status_code == 200
+        data = orjson.loads(response.content)
+        assert data["success"] is False
+        assert data["ai_available"] is False
+        assert "no ai provider configured" in data["error"].lower()
 
-    def test_recommendations_failure(self, client_with_provider):
+    def test_recommendations_failure(self, client_with_provider, recommendation_services):
         """When recommendation generation fails, should return 500."""
         client, provider, db = client_with_provider
 
-        result = {
-            "success": False,
-            "error": "Failed to parse AI response",
-        }
+        recommendation_services.recommend.return_value = RECOMMENDATIONS_PARSE_FAILURE
 
-        with patch(
-            "src.routers.ai.generate_metric_recommendations",
-            new_callable=AsyncMock,
-            return_value=result,
-        ):
-            response = client.post("/api/v1/ai/recommendations?framework=csf_2_0")
+        response = client.post("/api/v1/ai/recommendations?framework=csf_2_0")
 
         assert response.status_code == 500
 
@@ -123,50 +206,29 @@ class TestGetRecommendationsEndpoint:
 class TestCoverageGaps:
     """Tests for the GET /ai/recommendations/gaps endpoint."""
 
-    def test_coverage_gaps_calculation(self, client_with_provider):
+    def test_coverage_gaps_calculation(self, client_with_provider, recommendation_services):
         """Should return framework coverage gap analysis."""
         client, provider, db = client_with_provider
 
-        gaps = {
-            "framework_code": "csf_2_0",
-            "total_functions": 6,
-            "functions_with_metrics": 4,
-            "gaps": [
-                {
-                    "function_code": "de",
-                    "function_name": "Detect",
-                    "categories_without_metrics": ["DE.AE"],
-                    "metric_count": 2,
-                },
-                {
-                    "function_code": "rc",
-                    "function_name": "Recover",
-                    "categories_without_metrics": ["RC.CO"],
-                    "metric_count": 1,
-                },
-            ],
-        }
+        recommendation_services.gaps.return_value = COVERAGE_GAPS
 
-        with patch("src.routers.ai.get_coverage_gaps", return_value=gaps):
-            response = client.get("/api/v1/ai/recommendations/gaps?framework=csf_2_0")
+        response = client.get("/api/v1/ai/recommendations/gaps?framework=csf_2_0")
 
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
 
         assert data["total_functions"] == 6
         assert len(data["gaps"]) == 2
 
-    def test_coverage_gaps_error(self, client_with_provider):
+    def test_coverage_gaps_error(self, client_with_provider, recommendation_services):
         """When framework is not found, should return 404."""
         client, provider, db = client_with_provider
 
-        with patch(
-            "src.routers.ai.get_coverage_gaps",
-            return_value={"error": "Framework 'nonexistent' not found"},
-        ):
-            response = client.get(
-                "/api/v1/ai/recommendations/gaps?framework=nonexistent"
-            )
+        recommendation_services.gaps.return_value = {"error": "Framework 'nonexistent' not found"}
+
+        response = client.get(
+            "/api/v1/ai/recommendations/gaps?framework=nonexistent"
+        )
 
         assert response.status_code == 404
 
@@ -174,61 +236,30 @@ class TestCoverageGaps:
 class TestRecommendationsByFunction:
     """Tests for POST /ai/recommendations/suggest endpoint."""
 
-    def test_recommendations_by_function(self, client_with_provider):
+    def test_recommendations_by_function(self, client_with_provider, recommendation_services):
         """Should return suggestions filtered by function code."""
         client, provider, db = client_with_provider
 
-        result = {
-            "success": True,
-            "suggestions": [
-                {
-                    "metric_name": "Alert Triage Time",
-                    "function_code": "de",
-                    "category_code": "DE.AE",
-                    "description": "Average time to triage security alerts",
-                }
-            ],
-        }
+        recommendation_services.suggest.return_value = DETECT_SUGGESTIONS_RESULT
 
-        with patch(
-            "src.routers.ai.suggest_metrics_for_gap",
-            new_callable=AsyncMock,
-            return_value=result,
-        ):
-            response = client.post(
-                "/api/v1/ai/recommendations/suggest"
-                "?framework=csf_2_0&function_code=de&count=5"
-            )
-
-        assert response.status_code == 200
-        data = response.json()
-        assert data["success"] is True
-
-    def test_recommendations_suggest_no_provider(self, client, mock_db):
-        """When no AI provider is available, should return 503."""
         response = client.post(
-            "/api/v1/ai/recommendations/suggest?framework=csf_2_0"
+            "/api/v1/ai/recommendations/suggest"
+            "?framework=csf_2_0&function_code=de&count=5"
         )
 
-        assert response.status_code == 503
+        assert response.status_code == 200
+        data = orjson.loads(response.content)
+        assert data["success"] is True
 
-    def test_recommendations_suggest_failure(self, client_with_provider):
+    def test_recommendations_suggest_failure(self, client_with_provider, recommendation_services):
         """When suggestion generation fails, should return 500."""
         client, provider, db = client_with_provider
 
-        result = {
-            "success": False,
-            "error": "AI generation failed",
-        }
+        recommendation_services.suggest.return_value = SUGGESTIONS_FAILURE
 
-        with patch(
-            "src.routers.ai.suggest_metrics_for_gap",
-            new_callable=AsyncMock,
-            return_value=result,
-        ):
-            response = client.post(
-                "/api/v1/ai/recommendations/suggest?framework=csf_2_0"
-            )
+        response = client.post(
+            "/api/v1/ai/recommendations/suggest?framework=csf_2_0"
+        )
 
         assert response.status_code == 500
 
@@ -236,42 +267,28 @@ class TestRecommendationsByFunction:
 class TestMetricsDistribution:
     """Tests for GET /ai/recommendations/distribution endpoint."""
 
-    def test_distribution_endpoint(self, client_with_provider):
+    def test_distribution_endpoint(self, client_with_provider, recommendation_services):
         """Should return metric distribution across framework functions."""
         client, provider, db = client_with_provider
 
-        distribution = {
-            "framework_code": "csf_2_0",
-            "total_metrics": 208,
-            "distribution": {
-                "gv": {"count": 36, "percentage": 17.3},
-                "id": {"count": 35, "percentage": 16.8},
-                "pr": {"count": 44, "percentage": 21.2},
-                "de": {"count": 32, "percentage": 15.4},
-                "rs": {"count": 30, "percentage": 14.4},
-                "rc": {"count": 31, "percentage": 14.9},
-            },
-        }
+        recommendation_services.distribution.return_value = METRIC_DISTRIBUTION
 
-        with patch("src.routers.ai.get_metric_distribution", return_value=distribution):
-            response = client.get(
-                "/api/v1/ai/recommendations/distribution?framework=csf_2_0"
-            )
+        response = client.get(
+            "/api/v1/ai/recommendations/distribution?framework=csf_2_0"
+        )
 
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data["total_metrics"] == 208
 
-    def test_distribution_error(self, client_with_provider):
+    def test_distribution_error(self, client_with_provider, recommendation_services):
         """When framework is not found, should return 404."""
         client, provider, db = client_with_provider
 
-        with patch(
-            "src.routers.ai.get_metric_distribution",
-            return_value={"error": "Framework not found"},
-        ):
-            response = client.get(
-                "/api/v1/ai/recommendations/distribution?framework=bad_code"
-            )
+        recommendation_services.distribution.return_value = {"error": "Framework not found"}
+
+        response = client.get(
+            "/api/v1/ai/recommendations/distribution?framework=bad_code"
+        )
 
         assert response.status_code == 404
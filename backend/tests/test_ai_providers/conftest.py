@@ -1,11 +1,46 @@
 """Fixtures for AI provider tests."""
 import pytest
+import pytest_asyncio
+from types import SimpleNamespace
 from unittest.mock import MagicMock, AsyncMock, patch
 
+from httpx import ASGITransport, AsyncClient
+
 from src.services.ai.base_provider import ProviderCredentials, AIResponse
 
 
 @pytest.fixture
+def client(session_client):
+    """FastAPI TestClient shared across the test session."""
+    return session_client
+
+
+@pytest.fixture
+def mock_db(mock_db_session):
+    """Serve `mock_db_session` to the app through the get_db dependency."""
+    from src.db import get_db
+    from src.main import app
+
+    def override_get_db():
+        yield mock_db_session
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield mock_db_session
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest_asyncio.fixture
+async def async_client():
+    """Async httpx client that calls the app directly over ASGI."""
+    from src.main import app
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        yield ac
+
+
+@pytest.fixture(scope="session")
 def sample_credentials():
     """Sample credentials for testing."""
     return ProviderCredentials(
@@ -13,7 +48,7 @@ def sample_credentials():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def azure_credentials():
     """Sample Azure credentials for testing."""
     return ProviderCredentials(
@@ -24,7 +59,7 @@ def azure_credentials():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def aws_credentials():
     """Sample AWS credentials for testing."""
     return ProviderCredentials(
@@ -34,7 +69,7 @@ def aws_credentials():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def gcp_credentials():
     """Sample GCP credentials for testing."""
     return ProviderCredentials(
@@ -67,22 +102,42 @@ def sample_ai_response():
     )
 
 
+# Canned SDK responses, built once. Providers only read these attributes, so
+# plain namespaces stand in for the SDK objects without MagicMock overhead.
+ANTHROPIC_SDK_RESPONSE = SimpleNamespace(
+    content=(SimpleNamespace(text="Test response"),),
+    model="claude-sonnet-4-5-20250929",
+    usage=SimpleNamespace(input_tokens=10, output_tokens=20),
+    stop_reason="end_turn",
+)
+
+
+def _chat_completion_response(model):
+    """Build an OpenAI-style chat completion response for `model`."""
+    return SimpleNamespace(
+        choices=(
+            SimpleNamespace(
+                message=SimpleNamespace(content="Test response"),
+                finish_reason="stop",
+            ),
+        ),
+        model=model,
+        usage=SimpleNamespace(prompt_tokens=10, completion_tokens=20, total_tokens=30),
+    )
+
+
+OPENAI_SDK_RESPONSE = _chat_completion_response("gpt-4o")
+TOGETHER_SDK_RESPONSE = _chat_completion_response(
+    "meta-llama/Meta-Llama-3.1-70B-Instruct-Turbo"
+)
+
+
 @pytest.fixture
 def mock_anthropic_client():
     """Mock Anthropic client."""
     with patch("src.services.ai.providers.anthropic_provider.Anthropic") as mock:
-        client_instance = MagicMock()
-        mock.return_value = client_instance
-
-        # Mock the messages.create method
-        response = MagicMock()
-        response.content = [MagicMock(text="Test response")]
-        response.model = "claude-sonnet-4-5-20250929"
-        response.usage.input_tokens = 10
-        response.usage.output_tokens = 20
-        response.stop_reason = "end_turn"
-
-        client_instance.messages.create = MagicMock(return_value=response)
+        client_instance = mock.return_value
+        client_instance.messages.create = MagicMock(return_value=ANTHROPIC_SDK_RESPONSE)
 
         yield mock
 
@@ -91,18 +146,8 @@ def mock_anthropic_client():
 def mock_openai_client():
     """Mock OpenAI client."""
     with patch("src.services.ai.providers.openai_provider.OpenAI") as mock:
-        client_instance = MagicMock()
-        mock.return_value = client_instance
-
-        # Mock the chat.completions.create method
-        response = MagicMock()
-        response.choices = [MagicMock(message=MagicMock(content="Test response"), finish_reason="stop")]
-        response.model = "gpt-4o"
-        response.usage.prompt_tokens = 10
-        response.usage.completion_tokens = 20
-        response.usage.total_tokens = 30
-
-        client_instance.chat.completions.create = MagicMock(return_value=response)
+        client_instance = mock.return_value
+        client_instance.chat.completions.create = MagicMock(return_value=OPENAI_SDK_RESPONSE)
 
         yield mock
 
@@ -111,17 +156,7 @@ def mock_openai_client():
 def mock_together_client():
     """Mock Together client."""
     with patch("src.services.ai.providers.together_provider.Together") as mock:
-        client_instance = MagicMock()
-        mock.return_value = client_instance
-
-        # Mock the chat.completions.create method
-        response = MagicMock()
-        response.choices = [MagicMock(message=MagicMock(content="Test response"), finish_reason="stop")]
-        response.model = "meta-llama/Meta-Llama-3.1-70B-Instruct-Turbo"
-        response.usage.prompt_tokens = 10
-        response.usage.completion_tokens = 20
-        response.usage.total_tokens = 30
-
-        client_instance.chat.completions.create = MagicMock(return_value=response)
+        client_instance = mock.return_value
+        client_instance.chat.completions.create = MagicMock(return_value=TOGETHER_SDK_RESPONSE)
 
         yield mock
@@ -1,6 +1,5 @@
 """Tests for the base AI provider abstraction."""
 import pytest
-from dataclasses import asdict
 
 from src.services.ai.base_provider import (
     BaseAIProvider,
@@ -14,6 +13,8 @@ from src.services.ai.base_provider import (
     InvalidRequestError,
 )
 
+pytestmark = pytest.mark.fast
+
 
 class TestProviderType:
     """Tests for ProviderType enum."""
@@ -41,48 +42,58 @@ class TestProviderType:
 class TestProviderCredentials:
     """Tests for ProviderCredentials dataclass."""
 
-    def test_api_key_only(self):
-        """Test credentials with just API key."""
-        creds = ProviderCredentials(api_key="test-key")
-        assert creds.api_key == "test-key"
-        assert creds.azure_endpoint is None
-        assert creds.aws_access_key is None
-
-    def test_azure_credentials(self):
-        """Test Azure-specific credentials."""
-        creds = ProviderCredentials(
-            api_key="azure-key",
-            azure_endpoint="https://test.openai.azure.com",
-            azure_deployment="gpt-4o",
-            azure_api_version="2024-02-01",
-        )
-        assert creds.azure_endpoint == "https://test.openai.azure.com"
-        assert creds.azure_deployment == "gpt-4o"
-
-    def test_aws_credentials(self):
-        """Test AWS-specific credentials."""
-        creds = ProviderCredentials(
-            aws_access_key="AKIATEST",
-            aws_secret_key="secret123",
-            aws_region="us-east-1",
-        )
-        assert creds.aws_access_key == "AKIATEST"
-        assert creds.aws_region == "us-east-1"
-
-    def test_gcp_credentials(self):
-        """Test GCP-specific credentials."""
-        creds = ProviderCredentials(
-            gcp_project="my-project",
-            gcp_location="us-central1",
-            gcp_credentials_json='{"type": "service_account"}',
-        )
-        assert creds.gcp_project == "my-project"
-        assert creds.gcp_location == "us-central1"
+    @pytest.mark.parametrize(
+        "kwargs,unset",
+        [
+            pytest.param(
+                {"api_key": "test-key"},
+                ("azure_endpoint", "aws_access_key"),
+                id="api_key_only",
+            ),
+            pytest.param(
+                {
+                    "api_key": "azure-key",
+                    "azure_endpoint": "https://test.openai.azure.com",
+                    "azure_deployment": "gpt-4o",
+                    "azure_api_version": "2024-02-01",
+                },
+                ("aws_access_key", "gcp_project"),
+                id="azure",
+            ),
+            pytest.param(
+                {
+                    "aws_access_key": "AKIATEST",
+                    "aws_secret_key": "secret123",
+                    "aws_region": "us-east-1",
+                },
+                ("api_key", "azure_endpoint"),
+                id="aws",
+            ),
+            pytest.param(
+                {
+                    "gcp_project": "my-project",
+                    "gcp_location": "us-central1",
+                    "gcp_credentials_json": '{"type": "service_account"}',
+                },
+                ("api_key", "aws_access_key"),
+                id="gcp",
+            ),
+        ],
+    )
+    def test_credentials_construction(self, kwargs, unset):
+        """Test that provider-specific fields are stored and the rest stay None."""
+        creds = ProviderCredentials(**kwargs)
+        for field, value in kwargs.items():
+            assert getattr(creds, field) == value
+        for field in unset:
+            assert getattr(creds, field) is None
 
     def test_credentials_to_dict(self):
         """Test converting credentials to dictionary."""
         creds = ProviderCredentials(api_key="test-key")
-        creds_dict = asdict(creds)
+        # ProviderCredentials is flat, so vars() gives every field without
+        # asdict()'s recursive deep copy
+        creds_dict = vars(creds)
         assert creds_dict["api_key"] == "test-key"
         assert creds_dict["azure_endpoint"] is None
 
@@ -1,12 +1,25 @@
 """Tests for the AWS Bedrock provider."""
 import pytest
-from unittest.mock import patch, MagicMock
+from io import BytesIO
+from unittest.mock import MagicMock
 import json
 
-from src.services.ai.base_provider import ProviderType, ProviderCredentials
+from src.services.ai.base_provider import ProviderCredentials
+
+# The SDK is optional; the provider factory skips providers it cannot import
+boto3 = pytest.importorskip("boto3")
+
 from src.services.ai.providers.bedrock_provider import BedrockProvider
 
 
+# Encoded Bedrock invoke_model body for a Claude model
+CLAUDE_RESPONSE_BODY = json.dumps({
+    "content": [{"text": "Hello"}],
+    "usage": {"input_tokens": 5, "output_tokens": 5},
+    "stop_reason": "end_turn",
+}).encode()
+
+
 class TestBedrockProvider:
     """Tests for BedrockProvider class."""
 
@@ -15,7 +28,7 @@ class TestBedrockProvider:
         """Create a Bedrock provider instance."""
         return BedrockProvider()
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def credentials(self):
         """Sample AWS credentials."""
         return ProviderCredentials(
@@ -24,45 +37,20 @@ class TestBedrockProvider:
             aws_region="us-east-1",
         )
 
-    def test_provider_type(self, provider):
-        """Test provider type is correct."""
-        assert provider.provider_type == ProviderType.BEDROCK
-
     def test_is_available(self, provider):
         """Test Bedrock availability (depends on boto3)."""
         result = provider.is_available()
         assert isinstance(result, bool)
 
-    def test_get_available_models(self, provider):
-        """Test getting available models."""
-        models = provider.get_available_models()
-        assert len(models) > 0
-
-        model_ids = [m.model_id for m in models]
-        # Should have Claude and/or Llama models
-        assert any("claude" in m.lower() or "llama" in m.lower() or "titan" in m.lower() for m in model_ids)
-
-    def test_get_default_model(self, provider):
-        """Test getting default model."""
-        default = provider.get_default_model()
-        assert default is not None
-
     @pytest.mark.asyncio
-    async def test_validate_credentials_success(self, provider, credentials):
+    async def test_validate_credentials_success(self, provider, credentials, monkeypatch):
         """Test validating correct credentials."""
-        with patch("src.services.ai.providers.bedrock_provider.boto3") as mock_boto:
-            mock_client = MagicMock()
-            mock_boto.client.return_value = mock_client
+        mock_session = MagicMock()
+        monkeypatch.setattr(boto3, "Session", mock_session)
+        mock_client = mock_session.return_value.client.return_value
 
-            # Mock Bedrock response for Claude
-            response_body = json.dumps({
-                "content": [{"text": "Hello"}],
-                "usage": {"input_tokens": 5, "output_tokens": 5},
-                "stop_reason": "end_turn",
-            })
-            mock_client.invoke_model.return_value = {
-                "body": MagicMock(read=MagicMock(return_value=response_body.encode()))
-            }
+        mock_client.invoke_model.return_value = {"body": BytesIO(CLAUDE_RESPONSE_BODY)}
 
-            result = await provider.validate_credentials(credentials)
-            assert result is True
+        result = await provider.validate_credentials(credentials)
+        assert result is True
+        mock_client.invoke_model.assert_called_once()
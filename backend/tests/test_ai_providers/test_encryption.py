@@ -1,7 +1,5 @@
 """Tests for the credential encryption utility."""
-import os
 import pytest
-from unittest.mock import patch
 
 from src.services.ai.utils.encryption import CredentialEncryption
 
@@ -9,27 +7,34 @@ from src.services.ai.utils.encryption import CredentialEncryption
 class TestCredentialEncryption:
     """Tests for CredentialEncryption class."""
 
-    @pytest.fixture(autouse=True)
+    @pytest.fixture
     def reset_singleton(self):
-        """Reset the singleton before each test."""
-        # Clear the singleton state
+        """Reset the singleton around tests that build their own instance."""
         CredentialEncryption._instance = None
         CredentialEncryption._fernet = None
         yield
-        # Clean up after test
         CredentialEncryption._instance = None
         CredentialEncryption._fernet = None
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def test_master_key(self):
         """Generate a test master key."""
         return CredentialEncryption.generate_master_key()
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def encryption_with_key(self, test_master_key):
-        """Create encryption instance with test key."""
-        with patch.dict(os.environ, {"AI_CREDENTIALS_MASTER_KEY": test_master_key}):
-            return CredentialEncryption()
+        """Create one encryption instance with the test key for the session.
+
+        The instance keeps its own Fernet, so the singleton slot is cleared
+        again afterwards and tests that need a fresh instance are unaffected.
+        """
+        CredentialEncryption._instance = None
+        CredentialEncryption._fernet = None
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setenv("AI_CREDENTIALS_MASTER_KEY", test_master_key)
+            encryption = CredentialEncryption()
+        CredentialEncryption._instance = None
+        return encryption
 
     def test_generate_master_key(self):
         """Test master key generation."""
@@ -41,13 +46,12 @@ class TestCredentialEncryption:
         """Test that encryption is available when key is set."""
         assert encryption_with_key.is_available is True
 
-    def test_encryption_not_available_without_key(self):
+    @pytest.mark.usefixtures("reset_singleton")
+    def test_encryption_not_available_without_key(self, monkeypatch):
         """Test that encryption is not available without key."""
-        # Remove the key from environment entirely
-        env_without_key = {k: v for k, v in os.environ.items() if k != "AI_CREDENTIALS_MASTER_KEY"}
-        with patch.dict(os.environ, env_without_key, clear=True):
-            encryption = CredentialEncryption()
-            assert encryption.is_available is False
+        monkeypatch.delenv("AI_CREDENTIALS_MASTER_KEY", raising=False)
+        encryption = CredentialEncryption()
+        assert encryption.is_available is False
 
     def test_encrypt_decrypt_string(self, encryption_with_key):
         """Test encrypting and decrypting a simple string."""
@@ -95,23 +99,18 @@ class TestCredentialEncryption:
         assert decrypted["api_key"] == "test-key"
         assert decrypted["azure_endpoint"] is None
 
-    def test_decrypt_with_wrong_key(self, test_master_key):
+    @pytest.mark.usefixtures("reset_singleton")
+    def test_decrypt_with_wrong_key(self, encryption_with_key, monkeypatch):
         """Test that decryption fails with wrong key."""
         # Encrypt with one key
-        with patch.dict(os.environ, {"AI_CREDENTIALS_MASTER_KEY": test_master_key}):
-            encryption1 = CredentialEncryption()
-            encrypted = encryption1.encrypt("secret")
-
-        # Reset singleton before using different key
-        CredentialEncryption._instance = None
-        CredentialEncryption._fernet = None
+        encrypted = encryption_with_key.encrypt("secret")
 
         # Try to decrypt with different key
         new_key = CredentialEncryption.generate_master_key()
-        with patch.dict(os.environ, {"AI_CREDENTIALS_MASTER_KEY": new_key}):
-            encryption2 = CredentialEncryption()
-            with pytest.raises(ValueError):  # Our wrapper raises ValueError
-                encryption2.decrypt(encrypted)
+        monkeypatch.setenv("AI_CREDENTIALS_MASTER_KEY", new_key)
+        encryption2 = CredentialEncryption()
+        with pytest.raises(ValueError):  # Our wrapper raises ValueError
+            encryption2.decrypt(encrypted)
 
     def test_each_encryption_is_unique(self, encryption_with_key):
         """Test that encrypting the same value twice produces different ciphertext."""
@@ -1,11 +1,29 @@
 """Tests for the OpenAI provider."""
 import pytest
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
-from src.services.ai.base_provider import ProviderType, ProviderCredentials
+from src.services.ai.base_provider import ProviderCredentials
+
+# The SDK is optional; the provider factory skips providers it cannot import
+pytest.importorskip("openai")
+
+from src.services.ai.providers import openai_provider
 from src.services.ai.providers.openai_provider import OpenAIProvider
 
 
+# Response to the minimal validation call; providers only read it, so tests share it
+VALIDATION_RESPONSE = SimpleNamespace(
+    choices=[
+        SimpleNamespace(
+            message=SimpleNamespace(content="Hello"), finish_reason="stop"
+        )
+    ],
+    model="gpt-4o-mini",
+    usage=SimpleNamespace(prompt_tokens=5, completion_tokens=5, total_tokens=10),
+)
+
+
 class TestOpenAIProvider:
     """Tests for OpenAIProvider class."""
 
@@ -14,51 +32,27 @@ class TestOpenAIProvider:
         """Create an OpenAI provider instance."""
         return OpenAIProvider()
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def credentials(self):
         """Sample OpenAI credentials."""
         return ProviderCredentials(api_key="sk-test-12345")
 
-    def test_provider_type(self, provider):
-        """Test provider type is correct."""
-        assert provider.provider_type == ProviderType.OPENAI
-
-    def test_get_available_models(self, provider):
-        """Test getting available models."""
-        models = provider.get_available_models()
-        assert len(models) > 0
-
-        model_ids = [m.model_id for m in models]
-        assert "gpt-4o" in model_ids or any("gpt" in m.lower() for m in model_ids)
-
-    def test_get_default_model(self, provider):
-        """Test getting default model."""
-        default = provider.get_default_model()
-        assert default is not None
-
     @pytest.mark.asyncio
-    async def test_initialize_with_credentials(self, provider, credentials):
+    async def test_initialize_with_credentials(self, provider, credentials, monkeypatch):
         """Test initializing provider with credentials."""
-        with patch("src.services.ai.providers.openai_provider.OpenAI") as mock_client:
-            await provider.initialize(credentials)
-            mock_client.assert_called_once_with(api_key="sk-test-12345")
-            assert provider._initialized is True
+        mock_client = MagicMock()
+        monkeypatch.setattr(openai_provider, "OpenAI", mock_client)
+        await provider.initialize(credentials)
+        mock_client.assert_called_once_with(api_key="sk-test-12345")
+        assert provider._initialized is True
 
     @pytest.mark.asyncio
-    async def test_validate_credentials_success(self, provider, credentials):
+    async def test_validate_credentials_success(self, provider, credentials, monkeypatch):
         """Test validating correct credentials."""
-        with patch("src.services.ai.providers.openai_provider.OpenAI") as mock_client:
-            client_instance = MagicMock()
-            mock_client.return_value = client_instance
-
-            response = MagicMock()
-            response.choices = [MagicMock(message=MagicMock(content="Hello"), finish_reason="stop")]
-            response.model = "gpt-4o-mini"
-            response.usage.prompt_tokens = 5
-            response.usage.completion_tokens = 5
-            response.usage.total_tokens = 10
+        client_instance = MagicMock()
+        monkeypatch.setattr(openai_provider, "OpenAI", MagicMock(return_value=client_instance))
 
-            client_instance.chat.completions.create.return_value = response
+        client_instance.chat.completions.create.return_value = VALIDATION_RESPONSE
 
-            result = await provider.validate_credentials(credentials)
-            assert result is True
+        result = await provider.validate_credentials(credentials)
+        assert result is True
@@ -0,0 +1,70 @@
+"""Tests shared by every cloud AI provider implementation.
+
+Provider-specific behaviour (client initialization, credential validation,
+availability checks) stays in the per-provider test modules.
+"""
+import importlib
+from typing import NamedTuple, Optional, Tuple
+
+import pytest
+
+from src.services.ai.base_provider import ProviderType
+
+
+class ProviderSpec(NamedTuple):
+    """What the shared tests expect from one provider implementation."""
+
+    provider_type: ProviderType
+    module: str
+    class_name: str
+    model_families: Tuple[str, ...]
+    sdk: Optional[str]  # Optional SDK the module imports at load time
+
+
+PROVIDER_SPECS = [
+    ProviderSpec(ProviderType.ANTHROPIC, "anthropic_provider", "AnthropicProvider", ("claude",), "anthropic"),
+    ProviderSpec(ProviderType.OPENAI, "openai_provider", "OpenAIProvider", ("gpt",), "openai"),
+    ProviderSpec(ProviderType.TOGETHER, "together_provider", "TogetherProvider", ("llama", "meta"), "together"),
+    ProviderSpec(ProviderType.AZURE, "azure_provider", "AzureOpenAIProvider", ("gpt",), "openai"),
+    ProviderSpec(ProviderType.BEDROCK, "bedrock_provider", "BedrockProvider", ("claude", "llama", "titan"), "boto3"),
+    # google-genai is imported lazily, so the Vertex module always loads
+    ProviderSpec(ProviderType.VERTEX, "vertex_provider", "VertexAIProvider", ("gemini",), None),
+]
+
+
+@pytest.fixture(scope="session", params=PROVIDER_SPECS, ids=lambda s: s.provider_type.value)
+def spec(request):
+    """The provider under test."""
+    return request.param
+
+
+@pytest.fixture(scope="session")
+def provider(spec):
+    """Create one instance of the provider under test per session."""
+    if spec.sdk:
+        pytest.importorskip(spec.sdk)
+    module = importlib.import_module(f"src.services.ai.providers.{spec.module}")
+    return getattr(module, spec.class_name)()
+
+
+class TestProviderCommon:
+    """Tests every provider implementation must pass."""
+
+    def test_provider_type(self, provider, spec):
+        """Test provider type is correct."""
+        assert provider.provider_type == spec.provider_type
+
+    def test_get_available_models(self, provider, spec):
+        """Test getting available models."""
+        models = provider.get_available_models()
+        assert len(models) > 0
+
+        assert any(
+            family in m.model_id.lower() for m in models for family in spec.model_families
+        )
+
+    def test_get_default_model(self, provider, spec):
+        """Test getting default model."""
+        default = provider.get_default_model()
+        assert default is not None
+        assert any(family in default.lower() for family in spec.model_families)
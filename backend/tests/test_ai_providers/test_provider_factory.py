@@ -11,44 +11,20 @@ from src.services.ai.provider_factory import (
 from src.services.ai.provider_registry import PROVIDER_REGISTRY
 
 
+@pytest.fixture(scope="session", params=list(ProviderType), ids=lambda p: p.value)
+def any_provider(request):
+    """Build each registered provider once per session."""
+    return get_provider(request.param)
+
+
 class TestGetProvider:
     """Tests for get_provider function."""
 
-    def test_get_anthropic_provider(self):
-        """Test getting Anthropic provider instance."""
-        provider = get_provider(ProviderType.ANTHROPIC)
-        assert provider is not None
-        assert provider.provider_type == ProviderType.ANTHROPIC
-
-    def test_get_openai_provider(self):
-        """Test getting OpenAI provider instance."""
-        provider = get_provider(ProviderType.OPENAI)
-        assert provider is not None
-        assert provider.provider_type == ProviderType.OPENAI
-
-    def test_get_together_provider(self):
-        """Test getting Together provider instance."""
-        provider = get_provider(ProviderType.TOGETHER)
-        assert provider is not None
-        assert provider.provider_type == ProviderType.TOGETHER
-
-    def test_get_azure_provider(self):
-        """Test getting Azure provider instance."""
-        provider = get_provider(ProviderType.AZURE)
-        assert provider is not None
-        assert provider.provider_type == ProviderType.AZURE
-
-    def test_get_bedrock_provider(self):
-        """Test getting Bedrock provider instance."""
-        provider = get_provider(ProviderType.BEDROCK)
-        assert provider is not None
-        assert provider.provider_type == ProviderType.BEDROCK
-
-    def test_get_vertex_provider(self):
-        """Test getting Vertex provider instance."""
-        provider = get_provider(ProviderType.VERTEX)
-        assert provider is not None
-        assert provider.provider_type == ProviderType.VERTEX
+    def test_get_provider(self, any_provider, request):
+        """Test getting a provider instance for every provider type."""
+        provider_type = request.node.callspec.params["any_provider"]
+        assert any_provider is not None
+        assert any_provider.provider_type == provider_type
 
     def test_providers_are_instances(self):
         """Test that get_provider returns valid instances."""
@@ -128,30 +104,35 @@ class TestProviderRegistry:
         for provider_type in ProviderType:
             assert provider_type in PROVIDER_REGISTRY
 
-    def test_registry_provider_structure(self):
-        """Test that each registry entry has correct structure."""
-        for provider_type, info in PROVIDER_REGISTRY.items():
-            assert "code" in info
-            assert "name" in info
-            assert "description" in info
-            assert "auth_type" in info
-            assert "auth_fields" in info
-            assert "models" in info
-            assert "default_model" in info
-
-    def test_registry_models_have_required_fields(self):
-        """Test that models in registry have required fields."""
-        for provider_type, info in PROVIDER_REGISTRY.items():
-            for model in info["models"]:
-                assert hasattr(model, "model_id")
-                assert hasattr(model, "display_name")
-                assert hasattr(model, "context_window")
-
-    def test_registry_auth_fields_structure(self):
-        """Test that auth fields have correct structure."""
-        for provider_type, info in PROVIDER_REGISTRY.items():
-            for field in info["auth_fields"]:
-                assert "name" in field
-                assert "label" in field
-                assert "type" in field
-                assert "required" in field
+
+@pytest.mark.parametrize(
+    "provider_type,info",
+    [pytest.param(t, info, id=t.value) for t, info in PROVIDER_REGISTRY.items()],
+)
+class TestRegistryEntry:
+    """Tests for the structure of each provider registry entry."""
+
+    def test_registry_provider_structure(self, provider_type, info):
+        """Test that the registry entry has correct structure."""
+        assert "code" in info
+        assert "name" in info
+        assert "description" in info
+        assert "auth_type" in info
+        assert "auth_fields" in info
+        assert "models" in info
+        assert "default_model" in info
+
+    def test_registry_models_have_required_fields(self, provider_type, info):
+        """Test that the entry's models have required fields."""
+        for model in info["models"]:
+            assert hasattr(model, "model_id")
+            assert hasattr(model, "display_name")
+            assert hasattr(model, "context_window")
+
+    def test_registry_auth_fields_structure(self, provider_type, info):
+        """Test that the entry's auth fields have correct structure."""
+        for field in info["auth_fields"]:
+            assert "name" in field
+            assert "label" in field
+            assert "type" in field
+            assert "required" in field
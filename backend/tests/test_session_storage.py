@@ -0,0 +1,241 @@
+"""Tests for the session storage backends."""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
+import pytest
+
+from src.services import session_storage
+from src.services.session_storage import (
+    InMemorySessionStorage,
+    RedisSessionStorage,
+    SessionData,
+)
+
+TTL_SECONDS = 3600
+START = 1_700_000_000.0
+
+
+class FakeClock:
+    """Stands in for the `time` module inside session_storage."""
+
+    def __init__(self, now: float = START):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze session_storage's clock at START."""
+    fake = FakeClock()
+    monkeypatch.setattr(session_storage, "time", fake)
+    return fake
+
+
+def new_session(clock, email="user@example.com") -> SessionData:
+    return SessionData(email=email, created_at=clock.now, last_accessed=clock.now)
+
+
+class TestInMemorySessionStorage:
+    """Tests for InMemorySessionStorage expiry, cleanup and sharding."""
+
+    @pytest.fixture
+    def storage(self):
+        return InMemorySessionStorage(ttl_hours=TTL_SECONDS // 3600)
+
+    def test_get_after_expiry(self, storage, clock):
+        """An expired session reads as missing and is removed."""
+        storage.create("tok", new_session(clock), TTL_SECONDS)
+        clock.advance(TTL_SECONDS + 1)
+
+        assert storage.get("tok") is None
+        assert "tok" not in storage._shard("tok").sessions
+
+    def test_get_and_touch_after_expiry(self, storage, clock):
+        """get_and_touch does not revive an expired session."""
+        storage.create("tok", new_session(clock), TTL_SECONDS)
+        clock.advance(TTL_SECONDS + 1)
+
+        assert storage.get_and_touch("tok", TTL_SECONDS) is None
+        assert storage.get("tok") is None
+
+    def test_get_and_touch_extends_expiry(self, storage, clock):
+        """A touched session stays valid for a full TTL from the touch."""
+        storage.create("tok", new_session(clock), TTL_SECONDS)
+        clock.advance(TTL_SECONDS - 10)
+
+        before = storage.get_and_touch("tok", TTL_SECONDS)
+        clock.advance(TTL_SECONDS - 10)
+
+        assert before.last_accessed == START
+        assert storage.get("tok").last_accessed == START + TTL_SECONDS - 10
+
+    def test_cleanup_after_refresh_requeues_stale_entry(self, storage, clock):
+        """A refreshed session outlives its original heap entry."""
+        storage.create("tok", new_session(clock), TTL_SECONDS)
+        clock.advance(TTL_SECONDS - 10)
+        storage.get_and_touch("tok", TTL_SECONDS)
+
+        # Past the original expiry, but not the refreshed one
+        clock.advance(20)
+        assert storage.cleanup_expired() == 0
+        assert storage.get("tok") is not None
+
+        clock.advance(TTL_SECONDS)
+        assert storage.cleanup_expired() == 1
+        assert not storage._shard("tok").sessions
+
+    def test_cleanup_after_delete(self, storage, clock):
+        """A deleted session's heap entry is skipped, not counted."""
+        storage.create("gone", new_session(clock), TTL_SECONDS)
+        storage.create("kept", new_session(clock, "other@example.com"), TTL_SECONDS)
+        assert storage.delete("gone") == "user@example.com"
+
+        clock.advance(TTL_SECONDS + 1)
+
+        assert storage.cleanup_expired() == 1
+        assert all(not shard.expiry_heap for shard in storage._shards)
+
+    def test_delete_by_email_across_shards(self, storage, clock):
+        """delete_by_email removes a user's sessions from every shard."""
+        tokens = [f"user-tok-{i}" for i in range(32)]
+        for token in tokens:
+            storage.create(token, new_session(clock), TTL_SECONDS)
+        storage.create("other-tok", new_session(clock, "other@example.com"), TTL_SECONDS)
+        assert len({id(storage._shard(token)) for token in tokens}) > 1
+
+        assert storage.delete_by_email("user@example.com") == len(tokens)
+
+        assert all(storage.get(token) is None for token in tokens)
+        assert storage.get("other-tok") is not None
+        assert all("user@example.com" not in shard.by_email for shard in storage._shards)
+        assert storage.delete_by_email("user@example.com") == 0
+
+    def test_concurrent_creates_spread_across_shards(self, storage, clock):
+        """Sessions created from concurrent threads all land and spread out."""
+        barrier = threading.Barrier(8)
+
+        def create_batch(worker):
+            barrier.wait()
+            tokens = [f"w{worker}-tok-{i}" for i in range(50)]
+            for token in tokens:
+                storage.create(token, new_session(clock, f"{worker}@example.com"), TTL_SECONDS)
+            return tokens
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            batches = list(executor.map(create_batch, range(8)))
+
+        tokens = [token for batch in batches for token in batch]
+        assert all(storage.get(token) is not None for token in tokens)
+        assert sum(len(shard.sessions) for shard in storage._shards) == len(tokens)
+        assert sum(1 for shard in storage._shards if shard.sessions) > 1
+
+
+class TestRedisSessionStorage:
+    """Tests for RedisSessionStorage against an in-process fakeredis server."""
+
+    @pytest.fixture
+    def redis_storage(self, monkeypatch):
+        fakeredis = pytest.importorskip("fakeredis")
+        pool = fakeredis.FakeRedis(decode_responses=True).connection_pool
+        monkeypatch.setattr(session_storage, "_get_redis_pool", lambda url: pool)
+        return RedisSessionStorage("redis://fake", ttl_hours=TTL_SECONDS // 3600)
+
+    @staticmethod
+    def token_key(token):
+        return f"{RedisSessionStorage.TOKEN_PREFIX}{token}"
+
+    def test_session_stored_as_compact_orjson(self, redis_storage, clock):
+        """Payloads are orjson-encoded with epoch float timestamps."""
+        redis_storage.create("tok", new_session(clock), TTL_SECONDS)
+
+        raw = redis_storage._redis.get(self.token_key("tok"))
+
+        assert raw == orjson.dumps({
+            "email": "user@example.com",
+            "created_at": START,
+            "last_accessed": START,
+        }).decode()
+        assert redis_storage.get("tok") == new_session(clock)
+
+    def test_get_and_touch_resets_ttl_and_last_accessed(self, redis_storage, clock):
+        """The script returns the old payload and rewrites it with a fresh TTL."""
+        redis_storage.create("tok", new_session(clock), TTL_SECONDS)
+        redis_storage._redis.expire(self.token_key("tok"), 10)
+        clock.advance(60)
+
+        before = redis_storage.get_and_touch("tok", TTL_SECONDS)
+
+        assert before.last_accessed == START
+        assert redis_storage._redis.ttl(self.token_key("tok")) > 10
+        after = redis_storage.get("tok")
+        assert after.last_accessed == START + 60
+        assert after.created_at == START
+
+    def test_update_access_time_only_resets_ttl(self, redis_storage, clock):
+        """update_access_time is a bare EXPIRE and leaves the payload alone."""
+        redis_storage.create("tok", new_session(clock), TTL_SECONDS)
+        redis_storage._redis.expire(self.token_key("tok"), 10)
+        raw = redis_storage._redis.get(self.token_key("tok"))
+        clock.advance(60)
+
+        assert redis_storage.update_access_time("tok", TTL_SECONDS) is True
+
+        assert redis_storage._redis.ttl(self.token_key("tok")) > 10
+        assert redis_storage._redis.get(self.token_key("tok")) == raw
+
+    def test_reads_legacy_iso_payload(self, redis_storage, clock):
+        """Naive ISO timestamps from older versions are read as UTC epochs."""
+        legacy = orjson.dumps({
+            "email": "user@example.com",
+            "created_at": "2024-01-01T00:00:00",
+            "last_accessed": "2024-01-01T01:00:00",
+        })
+        redis_storage._redis.set(self.token_key("tok"), legacy, ex=TTL_SECONDS)
+
+        session = redis_storage.get_and_touch("tok", TTL_SECONDS)
+
+        assert session.created_at == 1_704_067_200.0
+        assert session.last_accessed == 1_704_070_800.0
+        assert redis_storage.get("tok").last_accessed == START
+
+    def test_delete_by_email_returns_count(self, redis_storage, clock):
+        """The delete script removes every token for the user and the index."""
+        for token in ("tok-1", "tok-2", "tok-3"):
+            redis_storage.create(token, new_session(clock), TTL_SECONDS)
+        redis_storage.create("other", new_session(clock, "other@example.com"), TTL_SECONDS)
+
+        assert redis_storage.delete_by_email("user@example.com") == 3
+
+        assert redis_storage.get("tok-1") is None
+        assert not redis_storage._redis.exists(
+            f"{RedisSessionStorage.EMAIL_PREFIX}user@example.com"
+        )
+        assert redis_storage.get("other") is not None
+
+    def test_missing_key(self, redis_storage, clock):
+        """Operations on an unknown token report it as missing."""
+        assert redis_storage.get("nope") is None
+        assert redis_storage.get_and_touch("nope", TTL_SECONDS) is None
+        assert redis_storage.update_access_time("nope", TTL_SECONDS) is False
+        assert redis_storage.delete("nope") is None
+        assert redis_storage.delete_by_email("nobody@example.com") == 0
+
+    def test_redis_pool_is_blocking_and_shared(self, monkeypatch):
+        """One BlockingConnectionPool, sized from config, is kept per URL."""
+        redis = pytest.importorskip("redis")
+        monkeypatch.setattr(session_storage, "_redis_pools", {})
+
+        pool = session_storage._get_redis_pool("redis://localhost:6379/0")
+
+        assert isinstance(pool, redis.BlockingConnectionPool)
+        assert pool.max_connections == session_storage.REDIS_POOL_SIZE
+        assert pool.timeout == session_storage.REDIS_POOL_TIMEOUT
+        assert pool.connection_kwargs["decode_responses"] is True
+        assert session_storage._get_redis_pool("redis://localhost:6379/0") is pool
+        assert session_storage._get_redis_pool("redis://localhost:6379/1") is not pool